@@ -0,0 +1,235 @@
+"""
+This Python script implements eviction-ordered caches on top of the linked list
+and hash map primitives from elementary_data_structures.py:
+1. LRUCache evicts the least recently used entry
+2. LFUCache evicts the least frequently used entry (oldest first on ties)
+3. memoize, a decorator that caches a function's results in either cache
+get, put and eviction are all O(1). A cache can be limited by the number of
+entries (maxsize), by the total weight of its values (maxweight), or both.
+Each cache counts its hits, misses and evictions.
+"""
+
+from elementary_data_structures import LinkedList
+
+
+class LRUCache:
+    """
+    Least-recently-used cache.
+    A dict maps each key to its linked list node, and the doubly linked list keeps
+    the keys in recency order: the head is evicted first, and every hit moves
+    its node to the tail.
+    """
+    def __init__(self, maxsize=128, maxweight=None, weigher=None):
+        self.maxsize = maxsize  # None means no limit on the number of entries
+        self.maxweight = maxweight  # None means no limit on the total weight
+        self.weigher = weigher  # Function value -> weight; every value weighs 1 without one
+        self.weight = 0  # Total weight of the cached values
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._order = LinkedList(items=(), doubly=True)  # Keys, least recent first
+        self._entries = {}  # key -> [node, value, weight]
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def _weigh(self, value):
+        return 1 if self.weigher is None else self.weigher(value)
+
+    def get(self, key, default=None):
+        """
+        Returns the cached value for key and marks it as most recently used.
+        Returns default if the key is not cached.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self._order.move_to_end(entry[0])  # Now the most recently used
+        return entry[1]
+
+    def put(self, key, value):
+        """
+        Stores value under key, evicting old entries until the limits hold again.
+        A value heavier than maxweight on its own, or any value when maxsize
+        is 0, is not cached at all.
+        """
+        weight = self._weigh(value)
+        if key in self._entries:
+            self._remove(key)  # Replace the old value and its weight
+        if self.maxsize == 0 or (self.maxweight is not None and weight > self.maxweight):
+            return
+        self._evict(1, weight)  # Make room before the new entry goes in
+        node = self._order.insert(key)
+        self._entries[key] = [node, value, weight]
+        self.weight += weight
+
+    def _over_limit(self, extra_count, extra_weight):
+        """ Checks if adding extra_count entries of extra_weight would break a limit. """
+        return ((self.maxsize is not None and len(self._entries) + extra_count > self.maxsize)
+                or (self.maxweight is not None and self.weight + extra_weight > self.maxweight))
+
+    def _evict(self, extra_count=0, extra_weight=0):
+        """ Drops the least recently used entries until the extra entries fit. """
+        while self._entries and self._over_limit(extra_count, extra_weight):
+            self._remove(self._order.head.data)
+            self.evictions += 1
+
+    def _remove(self, key):
+        node, _, weight = self._entries.pop(key)
+        self._order.remove_node(node)
+        self.weight -= weight
+
+    def pop(self, key, default=None):
+        """ Removes key from the cache and returns its value (or default). """
+        entry = self._entries.get(key)
+        if entry is None:
+            return default
+        self._remove(key)
+        return entry[1]
+
+    def clear(self):
+        """ Empties the cache. The counters are kept. """
+        self._order = LinkedList(items=(), doubly=True)
+        self._entries = {}
+        self.weight = 0
+
+    def stats(self):
+        """ Returns the hit/miss/eviction counters and the current size as a dict. """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "weight": self.weight,
+        }
+
+
+class LFUCache(LRUCache):
+    """
+    Least-frequently-used cache.
+    Keys are grouped into one doubly linked list per access count. A hit moves
+    the key from its count's list to the next one, and eviction takes the head
+    (the oldest key) of the lowest count's list, so everything stays O(1).
+    """
+    def __init__(self, maxsize=128, maxweight=None, weigher=None):
+        super().__init__(maxsize, maxweight, weigher)
+        self._buckets = {}  # access count -> LinkedList of keys, oldest first
+        self._min_count = 0  # Lowest access count that has a non-empty bucket
+
+    def _bucket(self, count):
+        bucket = self._buckets.get(count)
+        if bucket is None:
+            bucket = self._buckets[count] = LinkedList(items=(), doubly=True)
+        return bucket
+
+    def get(self, key, default=None):
+        """
+        Returns the cached value for key and bumps its access count.
+        Returns default if the key is not cached.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        node, value, weight, count = entry
+        self._unlink_from_bucket(node, count)
+        entry[0] = self._bucket(count + 1).insert(key)
+        entry[3] = count + 1
+        return value
+
+    def put(self, key, value):
+        """
+        Stores value under key, evicting the least frequently used entries until
+        the limits hold again. A new key starts with an access count of one;
+        updating an existing key counts as an access. Nothing is cached when
+        maxsize is 0.
+        """
+        weight = self._weigh(value)
+        entry = self._entries.get(key)
+        if self.maxsize == 0 or (self.maxweight is not None and weight > self.maxweight):
+            if entry is not None:
+                self._remove(key)  # Don't keep serving the stale value
+            return
+        if entry is not None:
+            node, _, old_weight, count = entry
+            self._unlink_from_bucket(node, count)
+            entry[0] = self._bucket(count + 1).insert(key)
+            entry[1], entry[2], entry[3] = value, weight, count + 1
+            self.weight += weight - old_weight
+            self._evict()  # A heavier value may push the cache over maxweight
+            return
+        self._evict(1, weight)  # Evict before inserting so the new key isn't the victim
+        self._entries[key] = [self._bucket(1).insert(key), value, weight, 1]
+        self.weight += weight
+        self._min_count = 1
+
+    def _unlink_from_bucket(self, node, count):
+        bucket = self._buckets[count]
+        bucket.remove_node(node)
+        if not len(bucket):
+            del self._buckets[count]
+            if self._min_count == count:
+                self._min_count = count + 1
+
+    def _evict(self, extra_count=0, extra_weight=0):
+        """ Drops the least frequently used entries until the extra entries fit. """
+        while self._entries and self._over_limit(extra_count, extra_weight):
+            if self._min_count not in self._buckets:
+                self._min_count = min(self._buckets)  # Only after a pop or a weight change
+            self._remove(self._buckets[self._min_count].head.data)
+            self.evictions += 1
+
+    def _remove(self, key):
+        node, _, weight, count = self._entries.pop(key)
+        self._unlink_from_bucket(node, count)
+        self.weight -= weight
+
+    def clear(self):
+        """ Empties the cache. The counters are kept. """
+        self._buckets = {}
+        self._entries = {}
+        self._min_count = 0
+        self.weight = 0
+
+
+_MISSING = object()  # Sentinel so cached None results still count as hits
+_KWARGS_MARK = object()  # Separates positional from keyword arguments in a key
+
+
+def memoize(maxsize=128, maxweight=None, weigher=None, policy="lru"):
+    """
+    Decorator that caches a function's results in an LRUCache (policy="lru")
+    or LFUCache (policy="lfu"). The arguments must be hashable.
+    The cache is available as the wrapper's cache attribute and its counters
+    through cache_info().
+    """
+    cache_class = {"lru": LRUCache, "lfu": LFUCache}[policy]
+
+    def decorator(func):
+        cache = cache_class(maxsize, maxweight, weigher)
+
+        def wrapper(*args, **kwargs):
+            key = args
+            if kwargs:
+                key = args + (_KWARGS_MARK,) + tuple(sorted(kwargs.items()))
+            result = cache.get(key, _MISSING)
+            if result is _MISSING:
+                result = func(*args, **kwargs)
+                cache.put(key, result)
+            return result
+
+        wrapper.cache = cache
+        wrapper.cache_info = cache.stats
+        wrapper.cache_clear = cache.clear
+        wrapper.__name__ = func.__name__
+        wrapper.__doc__ = func.__doc__
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    return decorator
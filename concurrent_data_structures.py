@@ -0,0 +1,264 @@
+"""
+This Python script contains concurrency-safe versions of the Stack and Queue
+from elementary_data_structures.py:
+1. ConcurrentStack and ConcurrentQueue for sharing between worker threads
+2. AsyncStack and AsyncQueue for sharing between asyncio coroutines
+Consumers can block on pop/dequeue (or await get) until an element shows up,
+optionally giving up after a timeout. Producers block the same way when a
+bounded container (maxsize) is full.
+Unlike the classes they wrap, these containers start empty.
+"""
+
+import asyncio
+import threading
+
+from elementary_data_structures import Queue, Stack
+
+
+class ConcurrentStack:
+    """
+    Thread-safe stack. One lock guards the underlying Stack and two conditions
+    share it, so a push only wakes up consumers and a pop only wakes up producers.
+    """
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize  # None means the stack is unbounded
+        self._stack = Stack(items=())  # Start empty rather than with dummy data
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)  # Signalled after a push
+        self._not_full = threading.Condition(self._lock)  # Signalled after a pop
+
+    def _has_room(self):
+        return self.maxsize is None or len(self._stack) < self.maxsize
+
+    def push(self, value, block=True, timeout=None):
+        """
+        Adds an element to the top of the stack.
+        Returns a message if the stack stays full (immediately when block is False).
+        """
+        with self._not_full:
+            if not self._has_room():
+                if not block or not self._not_full.wait_for(self._has_room, timeout):
+                    return "Stack is full!"
+            self._stack.push(value)
+            self._not_empty.notify()  # Hand the element to one waiting consumer
+        return None
+
+    def pop(self, block=True, timeout=None):
+        """
+        Removes and returns the top element of the stack, waiting up to timeout
+        seconds for one to arrive. Returns a message if the stack stays empty.
+        """
+        with self._not_empty:
+            if self._stack.is_empty():
+                if not block or not self._not_empty.wait_for(lambda: not self._stack.is_empty(), timeout):
+                    return "Stack is empty!"
+            value = self._stack.pop()
+            self._not_full.notify()  # One slot opened up for a producer
+        return value
+
+    def __len__(self):
+        with self._lock:
+            return len(self._stack)
+
+    def is_empty(self):
+        """ Checks if the stack is empty. """
+        return len(self) == 0
+
+    def display(self):
+        """
+        Displays the current stack elements.
+        """
+        with self._lock:
+            self._stack.display()
+
+
+class ConcurrentQueue:
+    """
+    Thread-safe FIFO queue on top of the ring-buffer Queue.
+    Works like ConcurrentStack: one lock, separate not-empty/not-full conditions.
+    Batch operations take the lock once per batch instead of once per element.
+    """
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize  # None means the queue is unbounded
+        # The wrapped queue is never bounded itself; this class enforces maxsize
+        self._queue = Queue(items=())
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+    def _free_slots(self):
+        if self.maxsize is None:
+            return float("inf")
+        return self.maxsize - len(self._queue)
+
+    def enqueue(self, value, block=True, timeout=None):
+        """
+        Adds an element to the end of the queue.
+        Returns a message if the queue stays full (immediately when block is False).
+        """
+        with self._not_full:
+            if self._free_slots() < 1:
+                if not block or not self._not_full.wait_for(lambda: self._free_slots() >= 1, timeout):
+                    return "Queue is full!"
+            self._queue.enqueue(value)
+            self._not_empty.notify()
+        return None
+
+    def enqueue_many(self, values, block=True, timeout=None):
+        """
+        Adds a batch of elements, waiting for room chunk by chunk when bounded.
+        Returns the number of elements accepted.
+        """
+        values = list(values)
+        accepted = 0
+        with self._not_full:
+            while accepted < len(values):
+                if self._free_slots() < 1:
+                    if not block or not self._not_full.wait_for(lambda: self._free_slots() >= 1, timeout):
+                        break
+                chunk = min(len(values) - accepted, self._free_slots())
+                self._queue.enqueue_many(values[accepted:accepted + chunk])
+                accepted += chunk
+                self._not_empty.notify(chunk)  # Up to chunk consumers can make progress
+        return accepted
+
+    def dequeue(self, block=True, timeout=None):
+        """
+        Removes and returns the front element of the queue, waiting up to timeout
+        seconds for one to arrive. Returns a message if the queue stays empty.
+        """
+        with self._not_empty:
+            if self._queue.is_empty():
+                if not block or not self._not_empty.wait_for(lambda: not self._queue.is_empty(), timeout):
+                    return "Queue is empty!"
+            value = self._queue.dequeue()
+            self._not_full.notify()
+        return value
+
+    def dequeue_many(self, count, block=True, timeout=None):
+        """
+        Removes up to count elements from the front of the queue.
+        Waits (up to timeout) only while the queue is completely empty, then
+        returns whatever is available, so the result may be shorter than count.
+        """
+        with self._not_empty:
+            if self._queue.is_empty():
+                if not block or not self._not_empty.wait_for(lambda: not self._queue.is_empty(), timeout):
+                    return []
+            items = self._queue.dequeue_many(count)
+            self._not_full.notify(len(items))
+        return items
+
+    def __len__(self):
+        with self._lock:
+            return len(self._queue)
+
+    def is_empty(self):
+        """ Checks if the queue is empty. """
+        return len(self) == 0
+
+    def display(self):
+        """
+        Displays the current queue elements.
+        """
+        with self._lock:
+            self._queue.display()
+
+
+class AsyncStack:
+    """
+    Stack for coroutines running on one event loop.
+    put and get are awaitable and suspend the coroutine instead of a thread.
+    No lock is needed around the Stack itself because the event loop only
+    switches tasks at await points.
+    """
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize
+        self._stack = Stack(items=())
+        self._changed = asyncio.Condition()  # Notified after every push and pop
+
+    def _has_room(self):
+        return self.maxsize is None or len(self._stack) < self.maxsize
+
+    async def put(self, value, timeout=None):
+        """
+        Pushes an element, waiting up to timeout seconds while the stack is full.
+        Returns a message if no room became available.
+        """
+        async with self._changed:
+            try:
+                await asyncio.wait_for(self._changed.wait_for(self._has_room), timeout)
+            except asyncio.TimeoutError:
+                return "Stack is full!"
+            self._stack.push(value)
+            self._changed.notify_all()
+        return None
+
+    async def get(self, timeout=None):
+        """
+        Pops the top element, waiting up to timeout seconds while the stack is empty.
+        Returns a message if nothing arrived.
+        """
+        async with self._changed:
+            try:
+                await asyncio.wait_for(self._changed.wait_for(lambda: not self._stack.is_empty()), timeout)
+            except asyncio.TimeoutError:
+                return "Stack is empty!"
+            value = self._stack.pop()
+            self._changed.notify_all()
+        return value
+
+    def __len__(self):
+        return len(self._stack)
+
+    def is_empty(self):
+        """ Checks if the stack is empty. """
+        return self._stack.is_empty()
+
+
+class AsyncQueue:
+    """
+    FIFO queue for coroutines, the asyncio counterpart of ConcurrentQueue.
+    """
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize
+        self._queue = Queue(items=())
+        self._changed = asyncio.Condition()
+
+    def _has_room(self):
+        return self.maxsize is None or len(self._queue) < self.maxsize
+
+    async def put(self, value, timeout=None):
+        """
+        Enqueues an element, waiting up to timeout seconds while the queue is full.
+        Returns a message if no room became available.
+        """
+        async with self._changed:
+            try:
+                await asyncio.wait_for(self._changed.wait_for(self._has_room), timeout)
+            except asyncio.TimeoutError:
+                return "Queue is full!"
+            self._queue.enqueue(value)
+            self._changed.notify_all()
+        return None
+
+    async def get(self, timeout=None):
+        """
+        Dequeues the front element, waiting up to timeout seconds while the queue is empty.
+        Returns a message if nothing arrived.
+        """
+        async with self._changed:
+            try:
+                await asyncio.wait_for(self._changed.wait_for(lambda: not self._queue.is_empty()), timeout)
+            except asyncio.TimeoutError:
+                return "Queue is empty!"
+            value = self._queue.dequeue()
+            self._changed.notify_all()
+        return value
+
+    def __len__(self):
+        return len(self._queue)
+
+    def is_empty(self):
+        """ Checks if the queue is empty. """
+        return self._queue.is_empty()
@@ -1,38 +1,396 @@
 """
 This Python script contains implementations of basic data structures:
 1. Arrays and Matrices
-2. Stacks and Queues (using arrays)
-3. Singly Linked List
+2. Stacks, Queues and Priority Queues (using arrays)
+3. Linked List (singly or doubly linked)
 It also allows interaction with these structures via a simple text-based interface.
-You can add, delete, and perform other operations interactively.
+You can add, delete, and perform other operations interactively, or replay a file of
+commands in batch mode ("python3 elementary_data_structures.py --batch FILE").
 Each data structure starts with some dummy data to test and play around with.
 """
 
+import argparse
+import array
+import contextlib
+import mmap
+import operator
+import os
+import pickle
+import struct
+import sys
+import threading
+import time
+
+try:
+    import numpy as np  # Optional: MyMatrix uses it for vectorized operations
+except ImportError:
+    np = None
+
+from selection import randomized_quickselect
+
+# array.array type codes and item sizes for the dtypes the typed buffers support
+_TYPECODES = {"int32": "i", "int64": "q", "float32": "f", "float64": "d"}
+_ITEMSIZES = {"int32": 4, "int64": 8, "float32": 4, "float64": 8}
+
+
+def _result_dtype(first, second):
+    """ Picks the dtype for combining two buffers: float wins over int, 64-bit over 32-bit. """
+    if first == second:
+        return first
+    if first.startswith("float") or second.startswith("float"):
+        return "float64"
+    return "int64"
+
+
+# Memory-mapped files: a 64-byte header followed by the raw elements in row-major order.
+# The header holds a magic string, the dtype name and the shape (one or two dimensions).
+_MAPPED_MAGIC = b"MSCSBUF1"
+_MAPPED_HEADER = struct.Struct("<8s8sQQQ")  # magic, dtype, ndim, dim 0, dim 1
+_MAPPED_HEADER_SIZE = 64  # Header is padded so the elements start 64-byte aligned
+_MAPPED_ACCESS = {"r": mmap.ACCESS_READ, "r+": mmap.ACCESS_WRITE, "c": mmap.ACCESS_COPY}
+
+
+def _open_mapped(path, dtype, shape, mode):
+    """ 
+    Maps the file at path into memory and returns (mmap, dtype, shape).
+    If the file doesn't exist it is created with the given dtype and shape and
+    filled with zeros. If it exists, its header must agree with any dtype or
+    shape that was passed in. mode is "r" (read-only, can be shared by several
+    processes), "r+" (writes go to the file) or "c" (copy-on-write, private).
+    """
+    if mode not in _MAPPED_ACCESS:
+        raise ValueError(f"Unsupported mode {mode!r}; use 'r', 'r+' or 'c'")
+    if not os.path.exists(path):
+        if shape is None or dtype is None:
+            raise FileNotFoundError(f"{path} doesn't exist; give a dtype and shape to create it")
+        if mode == "r":
+            raise FileNotFoundError(f"{path} doesn't exist and mode 'r' can't create it")
+        if dtype not in _TYPECODES:
+            raise ValueError(f"Unsupported dtype {dtype!r}")
+        dims = tuple(shape) + (0,) * (2 - len(shape))
+        with open(path, "wb") as file:
+            header = _MAPPED_HEADER.pack(_MAPPED_MAGIC, dtype.encode(), len(shape), *dims)
+            file.write(header.ljust(_MAPPED_HEADER_SIZE, b"\0"))
+            count = 1
+            for dim in shape:
+                count *= dim
+            file.truncate(_MAPPED_HEADER_SIZE + count * _ITEMSIZES[dtype])  # Zero-filled, sparse on most filesystems
+    with open(path, "rb" if mode == "r" else "r+b") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=_MAPPED_ACCESS[mode])
+    magic, stored_dtype, ndim, dim0, dim1 = _MAPPED_HEADER.unpack_from(mapped)
+    if magic != _MAPPED_MAGIC:
+        mapped.close()
+        raise ValueError(f"{path} is not a memory-mapped array file")
+    stored_dtype = stored_dtype.rstrip(b"\0").decode()
+    stored_shape = (dim0, dim1)[:ndim]
+    if (dtype is not None and dtype != stored_dtype) or (shape is not None and tuple(shape) != stored_shape):
+        mapped.close()
+        raise ValueError(f"{path} holds {stored_dtype} data of shape {stored_shape}")
+    return mapped, stored_dtype, stored_shape
+
+
+def _write_mapped(path, dtype, shape, buffer):
+    """ Writes a buffer of elements as a file in the memory-mapped format above. """
+    dims = tuple(shape) + (0,) * (2 - len(shape))
+    with open(path, "wb") as file:
+        header = _MAPPED_HEADER.pack(_MAPPED_MAGIC, dtype.encode(), len(shape), *dims)
+        file.write(header.ljust(_MAPPED_HEADER_SIZE, b"\0"))
+        file.write(memoryview(buffer).cast("B"))
+
+
+# Snapshots of the other structures: a 64-byte header followed by the elements in order.
+# If every element is an int (or every one a float) they are stored as one contiguous
+# int64 (float64) payload; anything else is pickled in chunks of _SNAPSHOT_CHUNK elements.
+# Either way a load reads the file a chunk at a time, and nodes are never pickled,
+# so a long linked list can't hit the recursion limit.
+_SNAPSHOT_MAGIC = b"MSCSSNP1"
+_SNAPSHOT_HEADER = struct.Struct("<8s8s8sQQQ")  # magic, kind, encoding, count, flags, capacity
+_SNAPSHOT_CHUNK = 65536  # Elements written or read at a time
+
+
+def _snapshot_payload(values):
+    """ 
+    Picks the payload encoding for a list of elements and returns (encoding, typed array):
+    ("int64", ...) or ("float64", ...) when every element is exactly that type and fits,
+    ("pickle", None) otherwise.
+    """
+    types = set(map(type, values))  # Exact types, so bools and other int subclasses are pickled
+    for encoding, kind in (("int64", int), ("float64", float)):
+        if types <= {kind}:
+            try:
+                return encoding, array.array(_TYPECODES[encoding], values)
+            except OverflowError:
+                break  # An int too big for 64 bits
+    return "pickle", None
+
+
+def _write_snapshot(path, kind, values, flags=0, capacity=0):
+    """ 
+    Saves a list of elements as a snapshot of the given kind ("array", "stack",
+    "queue" or "list"). flags and capacity hold the structure's own settings.
+    """
+    encoding, typed = _snapshot_payload(values)
+    with open(path, "wb") as file:
+        header = _SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, kind.encode(), encoding.encode(),
+                                       len(values), flags, capacity)
+        file.write(header.ljust(_MAPPED_HEADER_SIZE, b"\0"))
+        if typed is not None:
+            typed.tofile(file)  # One contiguous block
+            return
+        for start in range(0, len(values), _SNAPSHOT_CHUNK):
+            payload = pickle.dumps(values[start:start + _SNAPSHOT_CHUNK], protocol=pickle.HIGHEST_PROTOCOL)
+            file.write(struct.pack("<Q", len(payload)))  # Length prefix, so a load can read chunk by chunk
+            file.write(payload)
+
+
+def _read_snapshot_header(file, kind, path):
+    """ 
+    Reads a snapshot header and checks it is of the given kind.
+    Returns (encoding, count, flags, capacity).
+    """
+    header = file.read(_MAPPED_HEADER_SIZE)
+    if len(header) < _SNAPSHOT_HEADER.size or not header.startswith(_SNAPSHOT_MAGIC):
+        raise ValueError(f"{path} is not a snapshot file")
+    _, stored_kind, encoding, count, flags, capacity = _SNAPSHOT_HEADER.unpack_from(header)
+    stored_kind = stored_kind.rstrip(b"\0").decode()
+    if stored_kind != kind:
+        raise ValueError(f"{path} holds a {stored_kind} snapshot, expected {kind}")
+    return encoding.rstrip(b"\0").decode(), count, flags, capacity
+
+
+def _snapshot_chunks(file, encoding, count):
+    """ Yields the elements of a snapshot as lists of up to _SNAPSHOT_CHUNK, reading as it goes. """
+    remaining = count
+    while remaining:
+        if encoding == "pickle":
+            (size,) = struct.unpack("<Q", file.read(8))
+            chunk = pickle.loads(file.read(size))
+        else:
+            values = array.array(_TYPECODES[encoding])
+            values.fromfile(file, min(remaining, _SNAPSHOT_CHUNK))
+            chunk = values.tolist()
+        remaining -= len(chunk)
+        yield chunk
+
+
+def load_snapshot(path, zero_copy=False):
+    """ 
+    Loads any snapshot written by a dump method and returns the structure
+    (MyArray, MyMatrix, Stack, Queue or LinkedList), whichever it was.
+    zero_copy is passed on to MyArray.load and MyMatrix.load.
+    """
+    with open(path, "rb") as file:
+        header = file.read(_MAPPED_HEADER_SIZE)
+    if header.startswith(_MAPPED_MAGIC):
+        ndim = _MAPPED_HEADER.unpack_from(header)[2]
+        return (MyArray if ndim == 1 else MyMatrix).load(path, zero_copy=zero_copy)
+    if not header.startswith(_SNAPSHOT_MAGIC):
+        raise ValueError(f"{path} is not a snapshot file")
+    kind = _SNAPSHOT_HEADER.unpack_from(header)[1].rstrip(b"\0").decode()
+    classes = {"array": MyArray, "stack": Stack, "queue": Queue, "list": LinkedList}
+    if kind == "array":
+        return MyArray.load(path, zero_copy=zero_copy)
+    return classes[kind].load(path)
+
+
 # Array implementation
 class MyArray:
     """ 
     This class implements basic array operations like insert, delete, and access.
-    The array starts with some dummy data to showcase its use.
+    The array starts with some dummy data to showcase its use, unless initial
+    items are given.
+    By default the elements live in a Python list. With a dtype (e.g. "int64"
+    or "float64") they are stored unboxed in an array.array instead, which
+    takes 4-8 bytes per element rather than a pointer plus a boxed object, and
+    exposes the buffer protocol: view() returns zero-copy memoryview slices and
+    extend() copies straight from other buffers.
+    MyArray.open(path, dtype, length) maps a file into memory instead, so arrays
+    larger than RAM load instantly; a mapped array has a fixed length.
     """
-    def __init__(self):
-        self.array = [1, 2, 3, 4, 5]  # Initial dummy data to get started
+    _mmap = None  # The mapping behind an array created by open()
+
+    def __init__(self, items=None, dtype=None):
+        if dtype is not None and dtype not in _TYPECODES:
+            raise ValueError(f"Unsupported dtype {dtype!r}")
+        self.dtype = dtype
+        if items is None:
+            items = [1, 2, 3, 4, 5]  # Initial dummy data to get started
+        if dtype is None:
+            self.array = list(items)
+        else:
+            self.array = array.array(_TYPECODES[dtype])
+            self.extend(items)
+
+    def __len__(self):
+        return len(self.array)
+
+    @property
+    def nbytes(self):
+        """ Bytes used by the element storage (the list's pointers plus boxed values when untyped). """
+        if self.dtype is not None:
+            return len(self.array) * self.array.itemsize
+        return sys.getsizeof(self.array) + sum(sys.getsizeof(value) for value in self.array)
+
+    @classmethod
+    def open(cls, path, dtype=None, length=None, mode="r+"):
+        """ 
+        Returns a typed array backed by a memory-mapped file.
+        An existing file is opened as is (dtype and length are read from its
+        header); a missing one is created with length zeros of the given dtype.
+        Writes go through view() (or .array[index] = value) and reach the file
+        on flush(). Use mode="r" to share one read-only mapping between processes.
+        """
+        mapped, dtype, shape = _open_mapped(path, dtype, None if length is None else (length,), mode)
+        if len(shape) != 1:
+            mapped.close()
+            raise ValueError(f"{path} holds a matrix; use MyMatrix.open")
+        mapped_array = cls.__new__(cls)
+        mapped_array.dtype = dtype
+        mapped_array._mmap = mapped
+        mapped_array.array = memoryview(mapped)[_MAPPED_HEADER_SIZE:].cast(_TYPECODES[dtype])
+        return mapped_array
+
+    def flush(self):
+        """ Writes changes to a memory-mapped array back to its file. """
+        if self._mmap is not None and not self._mmap.closed:
+            self._mmap.flush()
+
+    def close(self):
+        """ Flushes and unmaps a memory-mapped array. Views of it must be released first. """
+        if self._mmap is not None:
+            self.array.release()
+            if not self._mmap.closed:
+                self._mmap.close()
+
+    def dump(self, path):
+        """ 
+        Saves the array to path. A typed array is written in the memory-mapped
+        format, so it can be mapped back without copying; a list-backed one is
+        written as a snapshot.
+        """
+        if self.dtype is not None:
+            _write_mapped(path, self.dtype, (len(self.array),), self.array)
+        else:
+            _write_snapshot(path, "array", list(self.array))
+
+    @classmethod
+    def load(cls, path, zero_copy=False):
+        """ 
+        Loads an array saved by dump().
+        With zero_copy=True a typed array isn't read at all: the file is mapped
+        copy-on-write (see open()), so loading is instant, changes stay in memory
+        and the array has a fixed length.
+        """
+        with open(path, "rb") as file:
+            header = file.read(_MAPPED_HEADER_SIZE)
+            if not header.startswith(_MAPPED_MAGIC):
+                if zero_copy:
+                    raise ValueError("Only typed arrays can be loaded without copying")
+                file.seek(0)
+                encoding, count, _, _ = _read_snapshot_header(file, "array", path)
+                loaded = cls(items=())
+                for chunk in _snapshot_chunks(file, encoding, count):
+                    loaded.array.extend(chunk)
+                return loaded
+            _, dtype, ndim, length, _ = _MAPPED_HEADER.unpack_from(header)
+            if ndim != 1:
+                raise ValueError(f"{path} holds a matrix; use MyMatrix.load")
+            if zero_copy:
+                return cls.open(path, mode="c")
+            loaded = cls(items=(), dtype=dtype.rstrip(b"\0").decode())
+            loaded.array.fromfile(file, length)  # Straight into the typed buffer
+            return loaded
+
+    def _resizable(self):
+        """ Checks if the array can grow or shrink (memory-mapped ones can't). """
+        if self._mmap is not None:
+            print("A memory-mapped array has a fixed length!")
+            return False
+        return True
 
     def insert(self, value):
         """ 
         Adds an element to the end of the array. 
         """
-        self.array.append(value)  # Insert at the end of the array
+        if self._resizable():
+            self.array.append(value)  # Insert at the end of the array
+
+    def extend(self, values):
+        """ 
+        Adds many elements to the end of the array.
+        For a typed array, any buffer with the same element type and size
+        (another typed MyArray's view, an array.array, a NumPy array) is copied
+        in bulk as raw bytes; other iterables are appended element by element.
+        """
+        if not self._resizable():
+            return
+        if isinstance(values, MyArray):
+            values = values.array
+        if self.dtype is not None and _is_compatible_buffer(values, self.array):
+            self.array.frombytes(memoryview(values).cast("B"))
+        elif isinstance(values, array.array) and self.dtype is not None:
+            self.array.extend(iter(values))  # array.extend only accepts arrays of its own type code
+        else:
+            self.array.extend(values)
 
     def delete(self, index):
         """ 
         Deletes an element at a specific index. 
         Will print error message if the index is out of bounds.
         """
+        if not self._resizable():
+            return
         if 0 <= index < len(self.array):
             self.array.pop(index)  # Remove element at the given index
         else:
             print(f"Index {index} is out of bounds. Can't delete here!")
 
+    def delete_many(self, indices):
+        """ 
+        Deletes the elements at all the given indices in a single pass,
+        instead of shifting the tail once per deleted element.
+        Nothing is deleted if any index is out of bounds.
+        """
+        if not self._resizable():
+            return
+        length = len(self.array)
+        if np is not None and self.dtype is not None:
+            indices = np.asarray(indices, dtype=np.intp)
+            if indices.size and (indices.min() < 0 or indices.max() >= length):
+                print("Index out of bounds. Can't delete here!")
+                return
+            keep = np.ones(length, dtype=bool)
+            keep[indices] = False
+            kept = np.frombuffer(self.array, dtype=self.dtype)[keep]
+            self.array = array.array(self.array.typecode, kept.tobytes())
+            return
+        drop = set(indices)
+        if drop and (min(drop) < 0 or max(drop) >= length):
+            print("Index out of bounds. Can't delete here!")
+            return
+        kept = (value for index, value in enumerate(self.array) if index not in drop)
+        self.array = list(kept) if self.dtype is None else array.array(self.array.typecode, kept)
+
+    def filter(self, predicate):
+        """ 
+        Keeps only the elements for which predicate(element) is true, in one pass.
+        """
+        if not self._resizable():
+            return
+        kept = filter(predicate, self.array)
+        self.array = list(kept) if self.dtype is None else array.array(self.array.typecode, kept)
+
+    def view(self, start=None, stop=None):
+        """ 
+        Returns a zero-copy memoryview of the elements from start to stop
+        (typed arrays only). Writes through the view change the array.
+        The array can't grow or shrink while a view of it is alive, so release
+        views (view.release() or a with block) before inserting or deleting.
+        """
+        if self.dtype is None:
+            raise TypeError("Only a typed MyArray (created with a dtype) supports views")
+        return memoryview(self.array)[start:stop]
+
     def access(self, index):
         """ 
         Returns the element at the specified index. 
@@ -47,27 +405,160 @@ class MyArray:
         """ 
         Displays the array elements.
         """
-        print(f"Current array: {self.array}")  # Print the array to the console
-        
+        print(f"Current array: {list(self.array)}")  # Print the array to the console
+
+
+def _is_compatible_buffer(values, target):
+    """ 
+    Checks if values exposes a buffer whose elements can be copied into the
+    array.array target byte for byte (same kind of number, same size, and for
+    integers the same signedness: uppercase format codes are unsigned).
+    """
+    try:
+        source = memoryview(values)
+    except TypeError:
+        return False  # Not a buffer, e.g. a list or a generator
+    with source:
+        if source.itemsize != target.itemsize or not source.c_contiguous:
+            return False
+        code = source.format[-1]
+        if target.typecode in "fd":
+            return code in "fd"
+        return code in "bhilqn" and code.islower() == target.typecode.islower()
+
 # Matrix implementation
 class MyMatrix:
     """ 
     This class implements basic matrix operations like insert, delete, and access.
-    The matrix starts with some dummy data for demonstration.
+    The matrix starts with some dummy data for demonstration, unless a shape
+    (rows x cols, filled with zeros) or initial data (a list of rows) is given.
+    All cells live in one contiguous typed buffer: a 2D NumPy array when NumPy
+    is installed, otherwise a flat array.array in row-major order.
+    Besides the single-cell operations there are whole-matrix operations (add,
+    scale, transpose, matmul), row/column slicing, and batched cell updates that
+    take arrays of indices and check their bounds all at once.
+    MyMatrix.open(path, shape, dtype) maps a file into memory instead, so
+    matrices larger than RAM load instantly.
     """
-    def __init__(self):
-        # Initialize a 3x3 matrix with dummy data
-        self.matrix = [[1, 2, 3],
-                       [4, 5, 6],
-                       [7, 8, 9]]
+    _mmap = None  # The mapping behind a matrix created by open()
+
+    def __init__(self, rows=None, cols=None, dtype="int64", data=None):
+        if dtype not in _TYPECODES:
+            raise ValueError(f"Unsupported dtype {dtype!r}")
+        self.dtype = dtype
+        if data is None and rows is None:
+            # Initialize a 3x3 matrix with dummy data
+            data = [[1, 2, 3],
+                    [4, 5, 6],
+                    [7, 8, 9]]
+        if data is not None:
+            rows = len(data)
+            cols = len(data[0]) if rows else 0
+            if np is not None:
+                self._data = np.array(data, dtype=dtype).reshape(rows, cols)
+            else:
+                self._data = array.array(_TYPECODES[dtype], [value for row in data for value in row])
+        elif np is not None:
+            self._data = np.zeros((rows, cols), dtype=dtype)
+        else:
+            self._data = array.array(_TYPECODES[dtype], bytes(rows * cols * _ITEMSIZES[dtype]))
+        self.rows = rows
+        self.cols = cols
+
+    @classmethod
+    def _wrap(cls, buffer, rows, cols, dtype):
+        """ Builds a matrix around an existing buffer without copying it. """
+        matrix = cls.__new__(cls)
+        matrix._data = buffer
+        matrix.rows = rows
+        matrix.cols = cols
+        matrix.dtype = dtype
+        return matrix
+
+    @classmethod
+    def open(cls, path, shape=None, dtype=None, mode="r+"):
+        """ 
+        Returns a matrix backed by a memory-mapped file.
+        An existing file is opened as is (shape and dtype are read from its
+        header); a missing one is created as a rows x cols matrix of zeros.
+        Changes reach the file on flush(). Use mode="r" to share one read-only
+        mapping between processes.
+        """
+        mapped, dtype, shape = _open_mapped(path, dtype, shape, mode)
+        if len(shape) != 2:
+            mapped.close()
+            raise ValueError(f"{path} holds a 1D array; use MyArray.open")
+        rows, cols = shape
+        if np is not None:
+            buffer = np.frombuffer(mapped, dtype=dtype, count=rows * cols,
+                                   offset=_MAPPED_HEADER_SIZE).reshape(rows, cols)
+        else:
+            buffer = memoryview(mapped)[_MAPPED_HEADER_SIZE:].cast(_TYPECODES[dtype])
+        matrix = cls._wrap(buffer, rows, cols, dtype)
+        matrix._mmap = mapped
+        return matrix
+
+    def flush(self):
+        """ Writes changes to a memory-mapped matrix back to its file. """
+        if self._mmap is not None and not self._mmap.closed:
+            self._mmap.flush()
+
+    def close(self):
+        """ Flushes and unmaps a memory-mapped matrix. Rows and views of it must be dropped first. """
+        if self._mmap is not None:
+            if isinstance(self._data, memoryview):
+                self._data.release()
+            self._data = None  # Drop the NumPy array so the mapping has no exports left
+            if not self._mmap.closed:
+                self._mmap.close()
+
+    def dump(self, path):
+        """ Saves the matrix to path in the memory-mapped format (header, then the cells row by row). """
+        buffer = np.ascontiguousarray(self._data) if np is not None else self._data
+        _write_mapped(path, self.dtype, (self.rows, self.cols), buffer)
+
+    @classmethod
+    def load(cls, path, zero_copy=False):
+        """ 
+        Loads a matrix saved by dump().
+        With zero_copy=True the file is mapped copy-on-write (see open()) instead
+        of read, so loading is instant and changes stay in memory.
+        """
+        if zero_copy:
+            return cls.open(path, mode="c")
+        with open(path, "rb") as file:
+            magic, dtype, ndim, rows, cols = _MAPPED_HEADER.unpack_from(file.read(_MAPPED_HEADER_SIZE))
+            if magic != _MAPPED_MAGIC or ndim != 2:
+                raise ValueError(f"{path} is not a matrix snapshot")
+            dtype = dtype.rstrip(b"\0").decode()
+            if np is not None:
+                buffer = np.fromfile(file, dtype=dtype, count=rows * cols).reshape(rows, cols)
+            else:
+                buffer = array.array(_TYPECODES[dtype])
+                buffer.fromfile(file, rows * cols)
+        return cls._wrap(buffer, rows, cols, dtype)
+
+    @property
+    def shape(self):
+        return (self.rows, self.cols)
+
+    @property
+    def matrix(self):
+        """ Returns the matrix as a list of rows (a copy). """
+        if np is not None:
+            return self._data.tolist()
+        return [self._data[r * self.cols:(r + 1) * self.cols].tolist() for r in range(self.rows)]
+
+    def _in_bounds(self, row, col):
+        return 0 <= row < self.rows and 0 <= col < self.cols
 
     def insert(self, row, col, value):
         """ 
         Inserts a value at the specified row and column.
         Assumes the row and column are within bounds.
         """
-        if 0 <= row < len(self.matrix) and 0 <= col < len(self.matrix[0]):
-            self.matrix[row][col] = value  # Replace value at the given position
+        if self._in_bounds(row, col):
+            self._set(row, col, value)  # Replace value at the given position
         else:
             print("Row or column out of bounds!")
 
@@ -76,8 +567,8 @@ class MyMatrix:
         Deletes a value at the specified row and column by setting it to zero.
         Assumes the row and column are within bounds.
         """
-        if 0 <= row < len(self.matrix) and 0 <= col < len(self.matrix[0]):
-            self.matrix[row][col] = 0  # Set the value to zero (could simulate deletion)
+        if self._in_bounds(row, col):
+            self._set(row, col, 0)  # Set the value to zero (could simulate deletion)
         else:
             print("Row or column out of bounds!")
 
@@ -85,10 +576,168 @@ class MyMatrix:
         """ 
         Returns the value at the specified row and column.
         """
-        if 0 <= row < len(self.matrix) and 0 <= col < len(self.matrix[0]):
-            return self.matrix[row][col]  # Return the value
+        if self._in_bounds(row, col):
+            if np is not None:
+                return self._data[row, col].item()  # Plain Python number, not a NumPy scalar
+            return self._data[row * self.cols + col]
+        else:
+            return "Row or column out of bounds!"
+
+    def _set(self, row, col, value):
+        if np is not None:
+            self._data[row, col] = value
         else:
+            self._data[row * self.cols + col] = value
+
+    # Batched cell operations
+
+    def _check_indices(self, rows, cols):
+        """ 
+        Validates arrays of row and column indices in one pass.
+        Returns the indices ready for use, or an error message.
+        """
+        if np is not None:
+            rows = np.asarray(rows, dtype=np.intp)
+            cols = np.asarray(cols, dtype=np.intp)
+            if rows.shape != cols.shape:
+                return "Row and column index lists must have the same length!"
+            if rows.size and (rows.min() < 0 or rows.max() >= self.rows
+                              or cols.min() < 0 or cols.max() >= self.cols):
+                return "Row or column out of bounds!"
+            return rows, cols
+        rows, cols = list(rows), list(cols)
+        if len(rows) != len(cols):
+            return "Row and column index lists must have the same length!"
+        if rows and (min(rows) < 0 or max(rows) >= self.rows or min(cols) < 0 or max(cols) >= self.cols):
             return "Row or column out of bounds!"
+        return rows, cols
+
+    def insert_many(self, rows, cols, values):
+        """ 
+        Sets cell (rows[i], cols[i]) to values[i] for every i.
+        values may also be a single number that is written to every cell.
+        Nothing is written if any index is out of bounds.
+        """
+        checked = self._check_indices(rows, cols)
+        if isinstance(checked, str):
+            print(checked)  # Nothing is written
+            return
+        rows, cols = checked
+        if np is not None:
+            self._data[rows, cols] = values
+            return
+        if not hasattr(values, "__len__"):
+            values = [values] * len(rows)
+        width = self.cols
+        for row, col, value in zip(rows, cols, values):
+            self._data[row * width + col] = value
+
+    def delete_many(self, rows, cols):
+        """ 
+        Sets cell (rows[i], cols[i]) to zero for every i.
+        """
+        self.insert_many(rows, cols, 0)
+
+    def access_many(self, rows, cols):
+        """ 
+        Returns the values of cells (rows[i], cols[i]) as an array,
+        or an error message if the indices are invalid.
+        """
+        checked = self._check_indices(rows, cols)
+        if isinstance(checked, str):
+            return checked
+        rows, cols = checked
+        if np is not None:
+            return self._data[rows, cols]
+        width = self.cols
+        return array.array(_TYPECODES[self.dtype], [self._data[row * width + col] for row, col in zip(rows, cols)])
+
+    # Slicing
+
+    def row(self, index):
+        """ Returns one row as a 1D array (a view when backed by NumPy). """
+        if np is not None:
+            return self._data[index]
+        return self._data[index * self.cols:(index + 1) * self.cols]
+
+    def column(self, index):
+        """ Returns one column as a 1D array (a view when backed by NumPy). """
+        if np is not None:
+            return self._data[:, index]
+        return self._data[index::self.cols]
+
+    def submatrix(self, rows, cols):
+        """ 
+        Returns the block selected by the slices rows and cols as a new matrix,
+        e.g. matrix.submatrix(slice(0, 2), slice(1, 3)).
+        """
+        if np is not None:
+            block = self._data[rows, cols]
+            return self._wrap(block, block.shape[0], block.shape[1], self.dtype)
+        row_range = range(self.rows)[rows]
+        col_range = range(self.cols)[cols]
+        block = array.array(_TYPECODES[self.dtype])
+        for r in row_range:
+            block.extend(self._data[r * self.cols:(r + 1) * self.cols][cols])
+        return self._wrap(block, len(row_range), len(col_range), self.dtype)
+
+    # Whole-matrix arithmetic
+
+    def _same_shape(self, other):
+        if self.shape != other.shape:
+            raise ValueError(f"Matrix shapes {self.shape} and {other.shape} don't match")
+
+    def add(self, other):
+        """ Returns the element-wise sum of this matrix and another of the same shape. """
+        self._same_shape(other)
+        dtype = _result_dtype(self.dtype, other.dtype)
+        if np is not None:
+            return self._wrap(np.add(self._data, other._data, dtype=dtype), self.rows, self.cols, dtype)
+        summed = array.array(_TYPECODES[dtype], map(operator.add, self._data, other._data))
+        return self._wrap(summed, self.rows, self.cols, dtype)
+
+    def scale(self, factor):
+        """ Returns this matrix with every cell multiplied by factor. """
+        dtype = self.dtype if isinstance(factor, int) else _result_dtype(self.dtype, "float64")
+        if np is not None:
+            return self._wrap(np.multiply(self._data, factor, dtype=dtype), self.rows, self.cols, dtype)
+        scaled = array.array(_TYPECODES[dtype], [value * factor for value in self._data])
+        return self._wrap(scaled, self.rows, self.cols, dtype)
+
+    def transpose(self):
+        """ Returns the transposed matrix (cols x rows) as a new contiguous matrix. """
+        if np is not None:
+            return self._wrap(np.ascontiguousarray(self._data.T), self.cols, self.rows, self.dtype)
+        transposed = array.array(_TYPECODES[self.dtype])
+        for c in range(self.cols):
+            transposed.extend(self._data[c::self.cols])
+        return self._wrap(transposed, self.cols, self.rows, self.dtype)
+
+    def matmul(self, other):
+        """ Returns the matrix product self x other. """
+        if self.cols != other.rows:
+            raise ValueError(f"Can't multiply {self.shape} by {other.shape} matrices")
+        dtype = _result_dtype(self.dtype, other.dtype)
+        if np is not None:
+            product = np.matmul(self._data, other._data).astype(dtype, copy=False)
+            return self._wrap(product, self.rows, other.cols, dtype)
+        columns = [other._data[c::other.cols] for c in range(other.cols)]
+        product = array.array(_TYPECODES[dtype])
+        for r in range(self.rows):
+            row = self._data[r * self.cols:(r + 1) * self.cols]
+            product.extend(sum(map(operator.mul, row, column)) for column in columns)
+        return self._wrap(product, self.rows, other.cols, dtype)
+
+    def __add__(self, other):
+        return self.add(other)
+
+    def __mul__(self, factor):
+        return self.scale(factor)
+
+    __rmul__ = __mul__
+
+    def __matmul__(self, other):
+        return self.matmul(other)
 
     def display(self):
         """ 
@@ -102,10 +751,12 @@ class MyMatrix:
 class Stack:
     """ 
     Stack class where we can push elements to the top and pop from the top. 
-    It starts with some dummy values.
+    It starts with some dummy values unless initial items are given.
     """
-    def __init__(self):
-        self.stack = [10, 20, 30]  # Dummy values to start with
+    def __init__(self, items=None):
+        if items is None:
+            items = [10, 20, 30]  # Dummy values to start with
+        self.stack = list(items)
 
     def push(self, value):
         """ Adds an element to the top of the stack. """
@@ -118,39 +769,221 @@ class Stack:
         else:
             return "Stack is empty!"  # If stack is empty, return this message
 
+    def __len__(self):
+        return len(self.stack)
+
     def is_empty(self):
         """ Checks if the stack is empty. """
         return len(self.stack) == 0  # If no elements, it's empty
 
+    def dump(self, path):
+        """ Saves the stack to path as a snapshot, bottom element first. """
+        _write_snapshot(path, "stack", self.stack)
+
+    @classmethod
+    def load(cls, path):
+        """ Loads a stack saved by dump(), reading the file a chunk at a time. """
+        with open(path, "rb") as file:
+            encoding, count, _, _ = _read_snapshot_header(file, "stack", path)
+            loaded = cls(items=())
+            for chunk in _snapshot_chunks(file, encoding, count):
+                loaded.stack.extend(chunk)
+        return loaded
+
     def display(self):
         """ 
         Displays the current stack elements. 
         """
         print(f"Current stack: {self.stack}")  # Print the stack contents
 
-# Queue implementation using an array
+# Queue implementation using a circular buffer (ring buffer)
 class Queue:
     """ 
     Queue class with basic enqueue and dequeue operations. 
-    It starts with some dummy values.
+    It starts with some dummy values unless initial items are given.
+    The items live in a fixed-size circular buffer that doubles when it fills up,
+    so both enqueue and dequeue are O(1) amortized (no shifting like list.pop(0)).
+    An optional max_capacity bounds the queue: when it is full, enqueue either
+    rejects the value or, with block=True, waits until a consumer makes room.
     """
-    def __init__(self):
-        self.queue = [100, 200, 300]  # Dummy values to play with
+    def __init__(self, items=None, capacity=8, max_capacity=None, block=False):
+        if max_capacity is not None and max_capacity < 1:
+            raise ValueError("max_capacity must be at least 1")
+        self.max_capacity = max_capacity  # None means the queue can grow forever
+        self.block = block  # Whether a full queue makes producers wait
+        if max_capacity is not None:
+            capacity = min(capacity, max_capacity)  # Never allocate beyond the limit
+        self._buffer = [None] * max(capacity, 1)  # Fixed-size storage for the ring
+        self._head = 0  # Index of the front element
+        self._size = 0  # Number of elements currently stored
+        # Only a blocking queue needs a condition so producers can sleep while full
+        self._not_full = threading.Condition() if block else None
+        if items is None:
+            items = [100, 200, 300][:max_capacity]  # Dummy values to play with, cut to fit a small queue
+        items = list(items)
+        if len(items) > self._free_slots():
+            raise ValueError(f"{len(items)} initial items don't fit in max_capacity {max_capacity}")
+        if items:
+            self._write(items)  # Never block here: no consumer can exist yet
+
+    @property
+    def queue(self):
+        """ Returns the queue elements from front to back as a plain list. """
+        return self._snapshot(self._head, self._size)
+
+    def __len__(self):
+        return self._size
+
+    def _snapshot(self, start, count):
+        """ Copies count elements starting at buffer index start (wrapping around). """
+        capacity = len(self._buffer)
+        first = min(count, capacity - start)  # Elements before the wrap point
+        return self._buffer[start:start + first] + self._buffer[:count - first]
+
+    def _grow(self, needed):
+        """ 
+        Makes room for at least needed elements by doubling the buffer.
+        The elements are unrolled so the front ends up at index 0 again.
+        """
+        capacity = len(self._buffer)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2  # Geometric growth keeps enqueue O(1) amortized
+        if self.max_capacity is not None:
+            capacity = min(capacity, self.max_capacity)
+        items = self._snapshot(self._head, self._size)
+        self._buffer = items + [None] * (capacity - self._size)
+        self._head = 0
+
+    def _free_slots(self):
+        """ Returns how many more elements fit before hitting max_capacity. """
+        if self.max_capacity is None:
+            return float("inf")
+        return self.max_capacity - self._size
+
+    def _write(self, values):
+        """ Copies values onto the back of the ring using at most two slice assignments. """
+        count = len(values)
+        self._grow(self._size + count)
+        capacity = len(self._buffer)
+        tail = (self._head + self._size) % capacity  # First free slot
+        first = min(count, capacity - tail)  # How many fit before wrapping
+        self._buffer[tail:tail + first] = values[:first]
+        self._buffer[:count - first] = values[first:]
+        self._size += count
+
+    def _read(self, count):
+        """ Removes count elements from the front and returns them in order. """
+        capacity = len(self._buffer)
+        first = min(count, capacity - self._head)
+        items = self._buffer[self._head:self._head + first] + self._buffer[:count - first]
+        # Clear the vacated slots so the buffer doesn't keep old objects alive
+        self._buffer[self._head:self._head + first] = [None] * first
+        self._buffer[:count - first] = [None] * (count - first)
+        self._head = (self._head + count) % capacity
+        self._size -= count
+        return items
+
+    def enqueue(self, value, timeout=None):
+        """ 
+        Adds an element to the end of the queue. 
+        Returns a message if the queue is bounded and full (after waiting up to
+        timeout seconds when the queue blocks).
+        """
+        if self._not_full is None:
+            if self._free_slots() < 1:
+                return "Queue is full!"  # Reject mode: the value is dropped
+            self._write([value])  # Add value to the end of the queue
+            return None
+        with self._not_full:
+            if not self._not_full.wait_for(lambda: self._free_slots() >= 1, timeout):
+                return "Queue is full!"  # Timed out waiting for a consumer
+            self._write([value])
+        return None
+
+    def enqueue_many(self, values, timeout=None):
+        """ 
+        Adds a batch of elements to the end of the queue in one step.
+        Returns the number of elements accepted; in reject mode the batch is cut
+        short when the queue fills, in block mode it waits for room chunk by chunk.
+        """
+        values = list(values)
+        if self._not_full is None:
+            accepted = min(len(values), self._free_slots())
+            if accepted:
+                self._write(values[:accepted])
+            return accepted
+        accepted = 0
+        with self._not_full:
+            while accepted < len(values):
+                if not self._not_full.wait_for(lambda: self._free_slots() >= 1, timeout):
+                    break  # Timed out; report how far we got
+                chunk = min(len(values) - accepted, self._free_slots())
+                self._write(values[accepted:accepted + chunk])
+                accepted += chunk
+        return accepted
 
-    def enqueue(self, value):
-        """ Adds an element to the end of the queue. """
-        self.queue.append(value)  # Add value to the end of the queue
+    def _pop_front(self):
+        """ Removes and returns the single front element without any slicing. """
+        value = self._buffer[self._head]
+        self._buffer[self._head] = None  # Drop the reference held by the slot
+        self._head = (self._head + 1) % len(self._buffer)
+        self._size -= 1
+        return value
 
     def dequeue(self):
         """ Removes and returns the front element of the queue. """
+        if self._not_full is not None:
+            with self._not_full:
+                if self.is_empty():
+                    return "Queue is empty!"
+                value = self._pop_front()
+                self._not_full.notify()  # Wake up one waiting producer
+                return value
         if not self.is_empty():
-            return self.queue.pop(0)  # Remove the first element
+            return self._pop_front()  # Remove the first element
         else:
             return "Queue is empty!"  # If queue is empty, return message
 
+    def dequeue_many(self, count):
+        """ 
+        Removes up to count elements from the front of the queue and returns them as a list.
+        Raises ValueError for a negative count.
+        """
+        if count < 0:
+            raise ValueError(f"count must be non-negative, got {count}")
+        if self._not_full is not None:
+            with self._not_full:
+                items = self._read(min(count, self._size))
+                self._not_full.notify_all()  # Several slots may have opened up
+                return items
+        return self._read(min(count, self._size))
+
     def is_empty(self):
         """ Checks if the queue is empty. """
-        return len(self.queue) == 0  # Queue is empty if length is zero
+        return self._size == 0  # Queue is empty if size is zero
+
+    def is_full(self):
+        """ Checks if a bounded queue has reached its max capacity. """
+        return self._free_slots() < 1
+
+    def dump(self, path):
+        """ 
+        Saves the queue to path as a snapshot, front element first, together
+        with its max_capacity and block settings.
+        """
+        _write_snapshot(path, "queue", self.queue, flags=int(self.block), capacity=self.max_capacity or 0)
+
+    @classmethod
+    def load(cls, path):
+        """ Loads a queue saved by dump(), reading the file a chunk at a time. """
+        with open(path, "rb") as file:
+            encoding, count, flags, capacity = _read_snapshot_header(file, "queue", path)
+            loaded = cls(items=(), capacity=max(count, 8), max_capacity=capacity or None, block=bool(flags & 1))
+            for chunk in _snapshot_chunks(file, encoding, count):
+                loaded.enqueue_many(chunk)
+        return loaded
 
     def display(self):
         """ 
@@ -158,45 +991,350 @@ class Queue:
         """
         print(f"Current queue: {self.queue}")  # Print the queue contents
 
-# Singly linked list implementation
+# Priority queue implementation using an array-backed binary heap
+class PriorityQueue:
+    """ 
+    Min-priority queue: pop always returns the item with the smallest priority.
+    It starts with some dummy values unless initial items are given.
+    The heap lives in two parallel lists (priorities and items), where the
+    children of slot i are slots 2i + 1 and 2i + 2, so push and pop are
+    O(log n) and heapify builds the heap from bulk data in O(n).
+    With indexed=True a dict also maps each item to its slot, which lets
+    decrease_key find an item in O(1); indexed items must be hashable and
+    can only be queued once at a time.
+    """
+    def __init__(self, items=None, priorities=None, indexed=False):
+        self.indexed = indexed
+        self._priorities = []  # Heap-ordered priorities
+        self._items = []  # _items[i] has priority _priorities[i]
+        self._positions = {} if indexed else None  # item -> slot, kept up to date by every move
+        if items is None:
+            items = [40, 10, 30, 20]  # Dummy values; each is its own priority
+        self.heapify(items, priorities)
+
+    def __len__(self):
+        return len(self._items)
+
+    def _place(self, slot, priority, item):
+        """ Puts an entry into a slot and records its new position. """
+        self._priorities[slot] = priority
+        self._items[slot] = item
+        if self._positions is not None:
+            self._positions[item] = slot
+
+    def _sift_up(self, slot):
+        """ Moves the entry at slot up while it is smaller than its parent. """
+        priority, item = self._priorities[slot], self._items[slot]
+        while slot > 0:
+            parent = (slot - 1) // 2
+            if not priority < self._priorities[parent]:
+                break
+            self._place(slot, self._priorities[parent], self._items[parent])  # Pull the parent down
+            slot = parent
+        self._place(slot, priority, item)
+
+    def _sift_down(self, slot):
+        """ Moves the entry at slot down while one of its children is smaller. """
+        size = len(self._items)
+        priority, item = self._priorities[slot], self._items[slot]
+        while True:
+            child = 2 * slot + 1
+            if child >= size:
+                break
+            if child + 1 < size and self._priorities[child + 1] < self._priorities[child]:
+                child += 1  # Follow the smaller child
+            if not self._priorities[child] < priority:
+                break
+            self._place(slot, self._priorities[child], self._items[child])  # Pull the child up
+            slot = child
+        self._place(slot, priority, item)
+
+    def heapify(self, items, priorities=None):
+        """ 
+        Replaces the contents with items in O(n), by sifting down every parent
+        slot from the last one to the root. Without priorities, each item is
+        its own priority.
+        """
+        self._items = list(items)
+        self._priorities = list(priorities) if priorities is not None else list(self._items)
+        if len(self._priorities) != len(self._items):
+            raise ValueError("items and priorities must have the same length")
+        if self._positions is not None:
+            self._positions = {item: slot for slot, item in enumerate(self._items)}
+            if len(self._positions) != len(self._items):
+                raise ValueError("An indexed priority queue can't hold the same item twice")
+        for slot in range(len(self._items) // 2 - 1, -1, -1):
+            self._sift_down(slot)
+
+    def push(self, item, priority=None):
+        """ 
+        Adds an item in O(log n). Without a priority, the item is its own priority.
+        """
+        if self._positions is not None and item in self._positions:
+            return "Item is already queued!"
+        self._priorities.append(item if priority is None else priority)
+        self._items.append(item)
+        self._sift_up(len(self._items) - 1)
+        return None
+
+    def pop(self):
+        """ Removes and returns the item with the smallest priority in O(log n). """
+        if self.is_empty():
+            return "Priority queue is empty!"  # If the heap is empty, return this message
+        top = self._items[0]
+        last_priority, last_item = self._priorities.pop(), self._items.pop()
+        if self._positions is not None:
+            del self._positions[top]
+        if self._items:
+            self._place(0, last_priority, last_item)  # Move the last entry to the root and sift it down
+            self._sift_down(0)
+        return top
+
+    def replace(self, item, priority=None):
+        """ 
+        Pops the item with the smallest priority and pushes a new one with a
+        single sift, which is cheaper than pop followed by push.
+        """
+        if self.is_empty():
+            return "Priority queue is empty!"
+        if self._positions is not None:
+            if item in self._positions and self._positions[item] != 0:
+                return "Item is already queued!"
+            del self._positions[self._items[0]]
+        top = self._items[0]
+        self._place(0, item if priority is None else priority, item)
+        self._sift_down(0)
+        return top
+
+    def peek(self):
+        """ Returns the item with the smallest priority without removing it. """
+        if self.is_empty():
+            return "Priority queue is empty!"
+        return self._items[0]
+
+    def decrease_key(self, item, priority):
+        """ 
+        Lowers the priority of a queued item in O(log n). Needs indexed=True.
+        Returns a message if the item isn't queued or the new priority is larger.
+        """
+        if self._positions is None:
+            raise ValueError("decrease_key needs an indexed priority queue")
+        slot = self._positions.get(item)
+        if slot is None:
+            return f"Item {item} not found!"
+        if self._priorities[slot] < priority:
+            return "New priority is larger than the current one!"
+        self._priorities[slot] = priority
+        self._sift_up(slot)
+        return None
+
+    def is_empty(self):
+        """ Checks if the priority queue is empty. """
+        return len(self._items) == 0
+
+    def display(self):
+        """ 
+        Displays the items in heap order (the first one is popped next).
+        """
+        print(f"Current priority queue: {self._items}")
+
+
+class _Descending:
+    """ Priority wrapper that reverses the order, turning PriorityQueue into a max-heap. """
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+
+TOP_K_SELECTION_RATIO = 0.0005  # Above this k / n, selection beats the heap (see structure_benchmarks.py)
+
+def nsmallest(values, k, method="auto"):
+    """ 
+    Returns the k smallest values in ascending order.
+    method "heap" keeps the k smallest values seen so far in a max-heap
+    (a PriorityQueue with reversed priorities) and replaces its top whenever a
+    smaller value comes along, which is O(n log k) but usually touches the heap
+    only about k log(n / k) times; "select" finds the k-th smallest with
+    randomized_quickselect and then sorts only what is below it (O(n + k log k));
+    "auto" uses the heap when k is at most TOP_K_SELECTION_RATIO of n and
+    selection otherwise.
+    """
+    values = list(values)
+    k = max(0, min(k, len(values)))
+    if k == 0:
+        return []
+    if method == "auto":
+        method = "heap" if k <= TOP_K_SELECTION_RATIO * len(values) else "select"
+    if method == "heap":
+        heap = PriorityQueue(items=values[:k], priorities=[_Descending(value) for value in values[:k]])
+        largest = heap.peek()  # The largest of the k kept so far
+        for index in range(k, len(values)):
+            value = values[index]
+            if value < largest:
+                heap.replace(value, _Descending(value))
+                largest = heap.peek()
+        return [heap.pop() for _ in range(k)][::-1]
+    if method != "select":
+        raise ValueError(f"Unknown method {method!r}; use 'auto', 'heap' or 'select'")
+    # Tuples, strings and other comparable objects stay on the pure-Python backend
+    backend = "auto" if set(map(type, values)) <= {int, float} else "python"
+    kth = randomized_quickselect(values.copy(), k, backend=backend)
+    smaller = sorted(value for value in values if value < kth)
+    # Copies of the k-th value fill up the rest; unordered values such as NaN can make smaller too long
+    return (smaller + [kth] * max(0, k - len(smaller)))[:k]
+
+top_k = nsmallest  # The same helper under the name used by the schedulers
+
+
+# Linked list implementation (singly linked by default, optionally doubly linked)
 class Node:
     """ 
     Node class is used to represent each node in the linked list. 
     It holds data and points to the next node in the list.
+    __slots__ keeps each node free of a per-instance __dict__, which saves memory.
     """
+    __slots__ = ("data", "next")
+
     def __init__(self, data=None):
         self.data = data  # Store the data value
         self.next = None  # Pointer to the next node (initially None)
 
+class DoublyNode(Node):
+    """ 
+    Node for a doubly linked list; it also points back to the previous node
+    and remembers the list it is in, so O(1) removals can check ownership.
+    """
+    __slots__ = ("prev", "owner")
+
+    def __init__(self, data=None):
+        super().__init__(data)
+        self.prev = None  # Pointer to the previous node (initially None)
+        self.owner = None  # The LinkedList holding this node, None while detached
+
 class LinkedList:
     """ 
     Linked list implementation. 
-    Starts with a few dummy nodes to demonstrate insertion and traversal.
+    Starts with a few dummy nodes to demonstrate insertion and traversal,
+    unless initial items are given.
+    The list keeps a tail pointer and a length counter, so appending is O(1).
+    With doubly=True each node also links back to its predecessor, which lets
+    remove_node unlink a node in O(1) given the handle returned by insert.
+    With indexed=True the list also keeps a hash map from each value to the
+    nodes holding it (in list order), so delete, contains and find are O(1)
+    expected time, the same layout an LRU cache uses. Indexed lists are always
+    doubly linked and their values must be hashable.
     """
-    def __init__(self):
+    def __init__(self, items=None, doubly=False, indexed=False):
+        self.indexed = indexed
+        self.doubly = doubly or indexed  # O(1) delete needs the back pointers
+        self._node_class = DoublyNode if self.doubly else Node
+        # value -> {node: None}; a dict keeps the duplicates in insertion order
+        self._index = {} if indexed else None
         self.head = None  # Start with an empty list
-        self.insert(11)  # Insert dummy data 11
-        self.insert(22)  # Insert dummy data 22
-        self.insert(33)  # Insert dummy data 33
+        self.tail = None  # Last node, so appends don't need to walk the list
+        self._length = 0  # Number of nodes in the list
+        if items is None:
+            items = [11, 22, 33]  # Dummy data to start with
+        self.extend(items)
+
+    def __len__(self):
+        return self._length
+
+    def __iter__(self):
+        current = self.head
+        while current:
+            yield current.data
+            current = current.next
 
     def insert(self, data):
-        """ Inserts a new node at the end of the linked list. """
-        new_node = Node(data)  # Create a new node
+        """ 
+        Inserts a new node at the end of the linked list. 
+        Returns the new node, which can later be passed to remove_node.
+        """
+        new_node = self._node_class(data)  # Create a new node
+        self._link_at_end(new_node)
+        return new_node
+
+    def _link_at_end(self, new_node):
+        """ Attaches a detached node after the current tail. """
         if self.head is None:
             self.head = new_node  # If list is empty, set new node as head
         else:
-            current = self.head  # Start from the head
-            while current.next:  # Traverse to the end
-                current = current.next
-            current.next = new_node  # Attach new node to the end
+            if self.doubly:
+                new_node.prev = self.tail  # Link back to the old last node
+            self.tail.next = new_node  # Attach new node to the end
+        if self.doubly:
+            new_node.owner = self
+        self.tail = new_node
+        self._length += 1
+        if self.indexed:
+            self._index.setdefault(new_node.data, {})[new_node] = None
+
+    def extend(self, iterable):
+        """ 
+        Appends every element of the iterable to the end of the list.
+        """
+        node_class = self._node_class
+        doubly = self.doubly
+        index = self._index
+        tail = self.tail
+        added = 0
+        for data in iterable:
+            new_node = node_class(data)
+            if doubly:
+                new_node.owner = self
+            if tail is None:
+                self.head = new_node  # First node of an empty list
+            else:
+                tail.next = new_node
+                if doubly:
+                    new_node.prev = tail
+            if index is not None:
+                index.setdefault(data, {})[new_node] = None
+            tail = new_node
+            added += 1
+        self.tail = tail
+        self._length += added
+
+    def _unlink(self, previous, node):
+        """ Removes node from the chain, given the node right before it (or None for the head). """
+        if previous is None:
+            self.head = node.next  # Removing the head
+        else:
+            previous.next = node.next  # Bypass the node to delete
+        if node.next is None:
+            self.tail = previous  # Removed the last node, so its predecessor is the new tail
+        elif self.doubly:
+            node.next.prev = previous
+        node.next = None  # Detach the removed node from the list
+        if self.doubly:
+            node.prev = None
+            node.owner = None
+        self._length -= 1
+        if self.indexed:
+            bucket = self._index[node.data]
+            del bucket[node]
+            if not bucket:
+                del self._index[node.data]  # Last copy of this value is gone
 
     def delete(self, data):
         """ Deletes the first node that contains the given data. """
         if self.head is None:
             print("List is empty!")  # If no nodes, can't delete anything
             return
+        if self.indexed:
+            node = self.find(data)  # First node with this value, straight from the index
+            if node is None:
+                print(f"Element {data} not found!")
+            else:
+                self._unlink(node.prev, node)
+            return
         if self.head.data == data:
-            self.head = self.head.next  # If head has the data, remove the head
+            self._unlink(None, self.head)  # If head has the data, remove the head
         else:
             current = self.head  # Start from the head
             while current.next and current.next.data != data:
@@ -204,7 +1342,81 @@ class LinkedList:
             if current.next is None:
                 print(f"Element {data} not found!")  # Element doesn't exist
             else:
-                current.next = current.next.next  # Bypass the node to delete
+                self._unlink(current, current.next)
+
+    def find(self, data):
+        """ 
+        Returns the first node that contains the given data, or None if there is none.
+        """
+        if self.indexed:
+            bucket = self._index.get(data)
+            return next(iter(bucket)) if bucket else None
+        current = self.head
+        while current is not None and current.data != data:
+            current = current.next  # Linear scan without an index
+        return current
+
+    def contains(self, data):
+        """ Checks if any node contains the given data. """
+        if self.indexed:
+            return data in self._index
+        return self.find(data) is not None
+
+    def __contains__(self, data):
+        return self.contains(data)
+
+    def remove_node(self, node):
+        """ 
+        Removes the given node from the list.
+        O(1) in doubly linked mode; a singly linked list has to search for
+        the node's predecessor first.
+        """
+        if self.doubly:
+            if node.owner is not self:
+                print("Node is not in this list!")  # Already removed, or linked into another list
+            else:
+                self._unlink(node.prev, node)
+            return
+        previous = None
+        current = self.head
+        while current is not None and current is not node:
+            previous, current = current, current.next
+        if current is None:
+            print("Node is not in this list!")
+        else:
+            self._unlink(previous, current)
+
+    def move_to_end(self, node):
+        """ 
+        Moves a node of a doubly linked list to the end of the list in O(1).
+        The node object is reused, so existing handles stay valid.
+        """
+        if not self.doubly:
+            raise ValueError("move_to_end needs a doubly linked list")
+        if node.owner is not self:
+            print("Node is not in this list!")  # Already removed, or linked into another list
+        elif node is not self.tail:
+            self._unlink(node.prev, node)
+            self._link_at_end(node)
+
+    def dump(self, path):
+        """ 
+        Saves the list to path as a snapshot of its values in order (plus the
+        doubly and indexed settings). Only the values are stored, never the
+        nodes, so long lists don't run into the recursion limit like pickle does.
+        """
+        flags = int(self.doubly) | int(self.indexed) << 1
+        _write_snapshot(path, "list", list(self), flags=flags)
+
+    @classmethod
+    def load(cls, path):
+        """ Loads a list saved by dump(), rebuilding the nodes a chunk at a time. """
+        with open(path, "rb") as file:
+            encoding, count, flags, _ = _read_snapshot_header(file, "list", path)
+            loaded = cls(items=(), doubly=bool(flags & 1), indexed=bool(flags & 2))
+            for chunk in _snapshot_chunks(file, encoding, count):
+                loaded.extend(chunk)
+        return loaded
 
     def traverse(self):
         """ 
@@ -332,7 +1544,191 @@ def main():
 
 
 
-# Running the interactive program
+# Batch mode: replay a file of commands without prompts or per-operation display
+
+BATCH_COMMANDS = """
+push V | pop                    (stack; also "stack push V", "stack pop")
+enqueue V | dequeue             (queue; also "queue enqueue V", "queue dequeue")
+array insert V | array delete I | array access I
+list insert V | list delete V | list find V
+matrix new R C | matrix set R C V | matrix delete R C | matrix get R C
+pq push V [P] | pq pop | pq decrease V P
+Blank lines and lines starting with # are skipped.
+"""
+
+def _number(text):
+    """ Parses a command argument as an int, or as a float if it isn't one. """
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+class _CountingWriter:
+    """ Passes text on to another stream and counts the writes, so run_batch can tell which commands printed an error. """
+    def __init__(self, stream):
+        self.stream = stream
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return self.stream.write(text)
+
+    def flush(self):
+        self.stream.flush()
+
+def new_batch_structures():
+    """ Returns the structures a batch run works on, all starting empty (the matrix is 3 x 3). """
+    return {
+        "array": MyArray(items=()),
+        "stack": Stack(items=()),
+        "queue": Queue(items=()),
+        "list": LinkedList(items=(), indexed=True),  # Indexed so deletes from long traces stay O(1)
+        "matrix": MyMatrix(3, 3),
+        "pq": PriorityQueue(items=(), indexed=True),
+    }
+
+def run_batch(lines, structures=None, quiet=True):
+    """ 
+    Applies one command per line (see BATCH_COMMANDS) to the structures, which
+    default to new_batch_structures(). lines can be any iterable of strings, such
+    as an open file or sys.stdin, so huge operation logs are streamed.
+    Nothing is displayed per operation; with quiet=True the messages the
+    structures print themselves (e.g. "Element 5 not found!") are discarded too.
+    Returns (stats, structures), where stats holds the number of operations,
+    the seconds taken, the operations per second, a count per command and the
+    line numbers of the first lines that failed. A line fails if it can't be
+    parsed, raises (e.g. MemoryError for a huge "matrix new"), or the structure
+    rejects it by returning or printing an error message ("Stack is empty!",
+    "Row or column out of bounds!", ...). Failed lines count as errors, not operations.
+    """
+    if structures is None:
+        structures = new_batch_structures()
+    stack, queue, linked_list = structures["stack"], structures["queue"], structures["list"]
+    my_array, heap = structures["array"], structures["pq"]
+
+    def new_matrix(rows, cols):
+        structures["matrix"] = MyMatrix(rows, cols)
+
+    # command -> (function, allowed argument counts)
+    commands = {
+        "push": (stack.push, (1,)),
+        "pop": (stack.pop, (0,)),
+        "enqueue": (queue.enqueue, (1,)),
+        "dequeue": (queue.dequeue, (0,)),
+        "array insert": (my_array.insert, (1,)),
+        "array delete": (my_array.delete, (1,)),
+        "array access": (my_array.access, (1,)),
+        "list insert": (linked_list.insert, (1,)),
+        "list delete": (linked_list.delete, (1,)),
+        "list find": (linked_list.find, (1,)),
+        "matrix new": (new_matrix, (2,)),
+        "matrix set": (lambda row, col, value: structures["matrix"].insert(row, col, value), (3,)),
+        "matrix delete": (lambda row, col: structures["matrix"].delete(row, col), (2,)),
+        "matrix get": (lambda row, col: structures["matrix"].access(row, col), (2,)),
+        "pq push": (heap.push, (1, 2)),
+        "pq pop": (heap.pop, (0,)),
+        "pq decrease": (heap.decrease_key, (2,)),
+    }
+    commands["stack push"], commands["stack pop"] = commands["push"], commands["pop"]
+    commands["queue enqueue"], commands["queue dequeue"] = commands["enqueue"], commands["dequeue"]
+    # command -> number of leading arguments that are indices or sizes, so parsed with int()
+    index_args = {"array delete": 1, "array access": 1, "matrix new": 2, "matrix set": 2,
+                  "matrix delete": 2, "matrix get": 2}
+
+    counts = dict.fromkeys(commands, 0)
+    bad_lines = []
+    errors = 0
+    output = open(os.devnull, "w") if quiet else sys.stdout
+    messages = _CountingWriter(output)  # The structures print some of their errors
+    start_time = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(messages):
+            for line_number, line in enumerate(lines, 1):
+                parts = line.split()
+                if not parts or parts[0].startswith("#"):
+                    continue
+                if parts[0] in structures and len(parts) > 1:
+                    name, args = f"{parts[0]} {parts[1]}", parts[2:]
+                else:
+                    name, args = parts[0], parts[1:]
+                entry = commands.get(name)
+                writes = messages.writes
+                try:
+                    if entry is None or len(args) not in entry[1]:
+                        raise ValueError(name)
+                    indices = index_args.get(name, 0)
+                    result = entry[0](*map(int, args[:indices]), *map(_number, args[indices:]))
+                    # Values are always numbers, so a string result is an error message
+                    failed = isinstance(result, str) or messages.writes != writes
+                except (ValueError, TypeError, IndexError, MemoryError):
+                    failed = True
+                if failed:
+                    errors += 1
+                    if len(bad_lines) < 10:
+                        bad_lines.append(line_number)  # Keep the first few for the report
+                    continue
+                counts[name] += 1
+    finally:
+        elapsed = time.perf_counter() - start_time
+        if quiet:
+            output.close()
+    operations = sum(counts.values())
+    stats = {
+        "operations": operations,
+        "seconds": elapsed,
+        "ops_per_second": operations / elapsed if elapsed else float("inf"),
+        "counts": {name: count for name, count in counts.items() if count},
+        "errors": errors,
+        "bad_lines": bad_lines,
+    }
+    return stats, structures
+
+def report_batch(stats, structures, show=False):
+    """ 
+    Prints the throughput of a batch run and the final size of every structure
+    (and its contents too with show=True).
+    """
+    print(f"{stats['operations']} operations in {stats['seconds']:.3f}s "
+          f"({stats['ops_per_second']:,.0f} ops/s)")
+    for name, count in stats["counts"].items():
+        print(f"  {name:<16}{count:>12}")
+    if stats["errors"]:
+        print(f"{stats['errors']} invalid or failed lines (first ones: {stats['bad_lines']})")
+    print("Final state:")
+    for name, structure in structures.items():
+        size = "x".join(map(str, structure.shape)) if name == "matrix" else len(structure)
+        print(f"  {name:<8}size {size}")
+    if show:
+        structures["array"].display()
+        structures["stack"].display()
+        structures["queue"].display()
+        structures["list"].traverse()
+        structures["matrix"].display()
+        structures["pq"].display()
+
+def batch_main(argv):
+    """ 
+    Command line entry point for batch mode:
+    python3 elementary_data_structures.py --batch FILE [--show]   (FILE "-" reads stdin)
+    """
+    parser = argparse.ArgumentParser(description="Replay a file of data structure commands.",
+                                     epilog="Commands:" + BATCH_COMMANDS,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch", required=True, metavar="FILE", help='command file, or "-" for stdin')
+    parser.add_argument("--show", action="store_true", help="display the structures at the end")
+    args = parser.parse_args(argv)
+    if args.batch == "-":
+        stats, structures = run_batch(sys.stdin)
+    else:
+        with open(args.batch) as file:
+            stats, structures = run_batch(file)
+    report_batch(stats, structures, show=args.show)
+
+
+# Running the interactive program (or batch mode when arguments are given)
 if __name__ == "__main__":
-    main()  # Call main function to start the program
+    if len(sys.argv) > 1:
+        batch_main(sys.argv[1:])
+    else:
+        main()  # Call main function to start the program
 
@@ -0,0 +1,259 @@
+"""
+This Python script finds the k-th smallest number in a file that may be far too big
+to load into memory. Two file formats are supported:
+1. "binary": raw little-endian numbers of one dtype (files written by MyArray.open,
+   which start with a 64-byte header, are recognized and the header is skipped)
+2. "text": one number per line
+The file is read sequentially in fixed-size blocks, and each pass over it narrows the
+range of values that can still hold rank k:
+- the first pass counts the numbers and keeps a small random sample,
+- each histogram pass puts the candidates into bins whose edges come from the sample,
+  finds the bin that holds rank k, and keeps a new sample from the candidates,
+- once few enough candidates remain, a last pass loads just them and the selection
+  is finished in memory with randomized_quickselect from selection.py.
+Memory use is bounded by block_size, sample_size and max_candidates. Every call
+reports how many passes it made and how many bytes it read.
+Run "python3 external_select.py" for a demonstration on generated files.
+"""
+
+import array
+import bisect
+import os
+import random
+import tempfile
+import time
+
+try:
+    import numpy as np  # Optional: processes each block with vectorized operations
+except ImportError:
+    np = None
+
+from elementary_data_structures import _MAPPED_HEADER, _MAPPED_HEADER_SIZE, _MAPPED_MAGIC, _TYPECODES
+from selection import randomized_quickselect
+
+
+def _read_blocks(path, file_format, dtype, block_size, stats):
+    """
+    Yields the numbers in the file one block at a time (NumPy arrays when NumPy is
+    installed, lists otherwise) and adds the bytes read to stats["bytes_read"].
+    """
+    stats["passes"] += 1
+    with open(path, "rb") as file:
+        if file_format == "binary":
+            itemsize = array.array(_TYPECODES[dtype]).itemsize
+            if file.read(len(_MAPPED_MAGIC)) == _MAPPED_MAGIC:
+                file.seek(_MAPPED_HEADER_SIZE)  # Skip the MyArray.open header
+                stats["bytes_read"] += _MAPPED_HEADER_SIZE
+            else:
+                file.seek(0)
+            block_size -= block_size % itemsize  # Never split a number across blocks
+            while True:
+                block = file.read(block_size)
+                if not block:
+                    return
+                stats["bytes_read"] += len(block)
+                if np is not None:
+                    yield np.frombuffer(block, dtype=np.dtype(dtype).newbyteorder("<"))
+                else:
+                    values = array.array(_TYPECODES[dtype])
+                    values.frombytes(block)
+                    yield values.tolist()
+        else:
+            parse = float if dtype.startswith("float") else int
+            leftover = b""
+            while True:
+                block = file.read(block_size)
+                stats["bytes_read"] += len(block)
+                if not block:
+                    if leftover.strip():
+                        yield _parse_lines([leftover], parse, dtype)
+                    return
+                lines = (leftover + block).split(b"\n")
+                leftover = lines.pop()  # The last line may continue in the next block
+                yield _parse_lines(lines, parse, dtype)
+
+
+def _parse_lines(lines, parse, dtype):
+    """ Converts the non-empty lines of a text block to numbers. """
+    numbers = [parse(line) for line in lines if line.strip()]
+    return np.array(numbers, dtype=dtype) if np is not None else numbers
+
+
+def _in_window(values, lower, upper):
+    """ Keeps the values strictly between lower and upper (None means unbounded). """
+    if np is not None:
+        if lower is not None:
+            values = values[values > lower]
+        if upper is not None:
+            values = values[values < upper]
+        return values
+    return [value for value in values
+            if (lower is None or value > lower) and (upper is None or value < upper)]
+
+
+class _ThinningSample:
+    """
+    Uniform random sample of a stream: every element is kept with probability p,
+    and whenever more than 2 * size elements are held, each is dropped with
+    probability 1/2 and p is halved. Memory stays below 2 * size elements.
+    """
+    def __init__(self, size, rng):
+        self.size = size
+        self.rng = rng
+        self.p = 1.0
+        self.items = []
+
+    def add_block(self, values):
+        if self.p < 1.0:
+            if np is not None:
+                coins = np.random.default_rng(self.rng.randrange(2 ** 32)).random(len(values))
+                values = values[coins < self.p]
+            else:
+                values = [value for value in values if self.rng.random() < self.p]
+        self.items.extend(values.tolist() if np is not None else values)
+        while len(self.items) > 2 * self.size:
+            self.items = [item for item in self.items if self.rng.random() < 0.5]
+            self.p /= 2
+
+
+def select_from_file(path, k, file_format="binary", dtype="float64", block_size=1 << 20,
+                     sample_size=65536, bins=64, max_candidates=1000000, seed=None):
+    """
+    Returns (value, stats): the k-th smallest number (1-based) in the file and a dict
+    with the number of passes over the file, the bytes read and the number of
+    candidates that were finally loaded.
+    block_size is the number of bytes read at a time, sample_size the number of
+    sampled values used to place the bin edges, bins the number of edges per
+    histogram pass, and max_candidates the most values ever loaded at once.
+    """
+    if file_format not in ("binary", "text"):
+        raise ValueError(f"Unknown file format {file_format!r}; use 'binary' or 'text'")
+    if file_format == "binary":
+        with open(path, "rb") as file:
+            header = file.read(_MAPPED_HEADER_SIZE)
+        if header.startswith(_MAPPED_MAGIC):
+            dtype = _MAPPED_HEADER.unpack_from(header)[1].rstrip(b"\0").decode()
+    rng = random.Random(seed)
+    stats = {"passes": 0, "bytes_read": 0, "candidates": 0}
+
+    def blocks():
+        return _read_blocks(path, file_format, dtype, block_size, stats)
+
+    # Pass 1: count the numbers and sample them
+    sample = _ThinningSample(sample_size, rng)
+    remaining = 0
+    for values in blocks():
+        remaining += len(values)
+        sample.add_block(values)
+    if not 1 <= k <= remaining:
+        raise ValueError(f"k must be between 1 and {remaining}")
+
+    lower = upper = None  # Candidates lie strictly between these values
+    rank = k  # Rank of the answer among the candidates
+    while remaining > max_candidates:
+        candidates = sorted(value for value in sample.items
+                            if (lower is None or value > lower) and (upper is None or value < upper))
+        if len(candidates) < 2 * bins:
+            if sample.p == 1.0 and len(candidates) == remaining:
+                # The sample already holds every candidate (fewer than 2 * bins), so no pass can narrow it further
+                stats["candidates"] = len(candidates)
+                return candidates[rank - 1], stats
+            # Too few sampled candidates to place good edges: take a fresh sample first
+            sample = _ThinningSample(sample_size, rng)
+            for values in blocks():
+                sample.add_block(_in_window(values, lower, upper))
+            continue
+        step = len(candidates) / bins
+        edges = sorted(set(candidates[int(i * step)] for i in range(1, bins)))
+
+        # Histogram pass: less[i] counts candidates between edges i-1 and i, equal[i] those equal to edge i
+        less = [0] * (len(edges) + 1)
+        equal = [0] * len(edges)
+        sample = _ThinningSample(sample_size, rng)
+        for values in blocks():
+            values = _in_window(values, lower, upper)
+            sample.add_block(values)
+            if np is not None:
+                left = np.searchsorted(edges, values, side="left")
+                on_edge = left < np.searchsorted(edges, values, side="right")
+                for index, count in enumerate(np.bincount(left[~on_edge], minlength=len(edges) + 1)):
+                    less[index] += int(count)
+                for index, count in enumerate(np.bincount(left[on_edge], minlength=len(edges))):
+                    equal[index] += int(count)
+            else:
+                for value in values:
+                    index = bisect.bisect_left(edges, value)
+                    if index < len(edges) and edges[index] == value:
+                        equal[index] += 1
+                    else:
+                        less[index] += 1
+
+        # Walk the bins in order until rank k is covered
+        for index in range(len(edges) + 1):
+            if rank <= less[index]:
+                lower = edges[index - 1] if index > 0 else lower
+                upper = edges[index] if index < len(edges) else upper
+                remaining = less[index]
+                break
+            rank -= less[index]
+            if index < len(edges):
+                if rank <= equal[index]:
+                    stats["candidates"] = 0
+                    return edges[index], stats  # Rank k is one of the copies of this edge
+                rank -= equal[index]
+
+    # Last pass: load the surviving candidates and finish in memory
+    survivors = []
+    for values in blocks():
+        values = _in_window(values, lower, upper)
+        survivors.extend(values.tolist() if np is not None else values)
+    stats["candidates"] = len(survivors)
+    if np is not None:
+        return randomized_quickselect(np.array(survivors), rank, backend="numpy"), stats
+    return randomized_quickselect(survivors, rank, backend="python"), stats
+
+
+def run_file_comparison(size=2000000, max_candidates=200000, seed=0):
+    """
+    Writes size random numbers to a binary file and a text file in a temporary
+    directory, finds their median with select_from_file, and compares the time,
+    passes and bytes read with loading the whole file and selecting in memory.
+    """
+    rng = random.Random(seed)
+    numbers = array.array("d", (rng.random() for _ in range(size)))
+    k = size // 2
+    expected = sorted(numbers)[k - 1]
+    with tempfile.TemporaryDirectory() as directory:
+        binary_path = os.path.join(directory, "numbers.bin")
+        text_path = os.path.join(directory, "numbers.txt")
+        with open(binary_path, "wb") as file:
+            numbers.tofile(file)
+        with open(text_path, "w") as file:
+            file.writelines(f"{value!r}\n" for value in numbers)
+
+        print(f"\nOut-of-core median of {size:,} numbers (at most {max_candidates:,} loaded):\n")
+        print(f"{'file':<8}{'MB':>8}{'seconds':>10}{'passes':>8}{'MB read':>10}{'loaded':>10}")
+        # Baseline: read the whole binary file into memory and select there
+        start_time = time.perf_counter()
+        with open(binary_path, "rb") as file:
+            loaded = array.array("d")
+            loaded.frombytes(file.read())
+        if np is not None:
+            value = np.partition(np.frombuffer(loaded, dtype="float64"), k - 1)[k - 1].item()
+        else:
+            value = sorted(loaded)[k - 1]
+        elapsed = time.perf_counter() - start_time
+        assert value == expected, "In-memory selection gave a wrong answer!"
+        print(f"{'in-mem':<8}{os.path.getsize(binary_path) / 1e6:>8.1f}{elapsed:>10.3f}{1:>8}"
+              f"{os.path.getsize(binary_path) / 1e6:>10.1f}{size:>10,}")
+        for label, path in (("binary", binary_path), ("text", text_path)):
+            start_time = time.perf_counter()
+            value, stats = select_from_file(path, k, file_format=label, max_candidates=max_candidates, seed=seed)
+            elapsed = time.perf_counter() - start_time
+            assert value == expected, "select_from_file gave a wrong answer!"
+            print(f"{label:<8}{os.path.getsize(path) / 1e6:>8.1f}{elapsed:>10.3f}{stats['passes']:>8}"
+                  f"{stats['bytes_read'] / 1e6:>10.1f}{stats['candidates']:>10,}")
+
+
+if __name__ == "__main__":
+    run_file_comparison()
@@ -0,0 +1,185 @@
+"""
+This Python script adds optional instrumentation to the data structures in
+elementary_data_structures.py and the selection algorithms in selection.py.
+While a Profiler is active (with profiler.enabled(): ...), their methods and
+functions are temporarily replaced by wrappers that record:
+1. how many times each operation ran (push, pop, enqueue, dequeue, insert, delete,
+   the PriorityQueue heap operations, ...)
+2. a latency histogram per operation (power-of-two nanosecond buckets)
+3. the deepest nesting of each function, i.e. the recursion depth of
+   select_median_of_medians and randomized_select
+4. the comparisons and swaps made by partition (and so by partition_random)
+When no profiler is active nothing is wrapped, so the structures and algorithms
+run exactly the code they always do, at no extra cost.
+The results are available as a dict (stats()) or as JSON (to_json()).
+"""
+
+import functools
+import json
+import time
+
+import elementary_data_structures
+import selection
+
+# Methods wrapped on each class while a profiler is active
+INSTRUMENTED_METHODS = {
+    elementary_data_structures.MyArray: ("insert", "extend", "delete", "delete_many", "access", "filter"),
+    elementary_data_structures.MyMatrix: ("insert", "delete", "access", "insert_many", "delete_many",
+                                          "access_many", "add", "scale", "transpose", "matmul"),
+    elementary_data_structures.Stack: ("push", "pop"),
+    elementary_data_structures.Queue: ("enqueue", "enqueue_many", "dequeue", "dequeue_many"),
+    elementary_data_structures.PriorityQueue: ("push", "pop", "replace", "heapify", "decrease_key"),
+    elementary_data_structures.LinkedList: ("insert", "extend", "delete", "find", "contains",
+                                            "remove_node", "move_to_end"),
+}
+
+# Functions of selection.py wrapped while a profiler is active
+INSTRUMENTED_FUNCTIONS = (
+    "deterministic_select",
+    "select_median_of_medians",
+    "randomized_quickselect",
+    "randomized_select",
+    "partition_random",
+    "multiselect",
+    "introselect",
+)
+
+
+class Profiler:
+    """
+    Collects operation counts, latencies, nesting depths and partition work.
+    Only one profiler can be active at a time. The counters aren't locked, so
+    with several threads the numbers are approximate.
+    """
+    _active = None  # The profiler whose wrappers are currently installed
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """ Clears everything recorded so far. """
+        self.counts = {}  # operation -> number of calls
+        self.total_ns = {}  # operation -> total time spent in it
+        self.histograms = {}  # operation -> {bucket: count}, bucket b holds latencies < 2**b ns
+        self.max_depth = {}  # operation -> deepest nesting seen
+        self._depth = {}  # operation -> current nesting
+        self.comparisons = 0  # Comparisons made by partition
+        self.swaps = 0  # Swaps made by partition
+
+    def _record(self, name, elapsed):
+        self.counts[name] = self.counts.get(name, 0) + 1
+        self.total_ns[name] = self.total_ns.get(name, 0) + elapsed
+        histogram = self.histograms.setdefault(name, {})
+        bucket = elapsed.bit_length()
+        histogram[bucket] = histogram.get(bucket, 0) + 1
+
+    def _wrap(self, name, func):
+        """ Returns a wrapper around func that records every call as operation name. """
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            depth = self._depth.get(name, 0) + 1
+            self._depth[name] = depth
+            if depth > self.max_depth.get(name, 0):
+                self.max_depth[name] = depth
+            start_time = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._record(name, time.perf_counter_ns() - start_time)
+                self._depth[name] = depth - 1
+        return wrapper
+
+    def _counting_partition(self, partition):
+        """
+        Returns a wrapper around the real partition that adds its comparisons and
+        swaps to the totals. Both follow from the indices alone: each of the
+        lt - low smaller elements took one comparison and one swap, every other
+        element took two comparisons, and each of the high - gt larger ones a swap.
+        """
+        @functools.wraps(partition)
+        def wrapper(arr, low, high, pivot):
+            lt, gt = partition(arr, low, high, pivot)
+            self.comparisons += (lt - low) + 2 * (high + 1 - lt)
+            self.swaps += (lt - low) + (high - gt)
+            return lt, gt
+        return wrapper
+
+    def start(self):
+        """ Installs the wrappers. Use enabled() to have them removed automatically. """
+        if Profiler._active is not None:
+            raise RuntimeError("Another profiler is already active")
+        Profiler._active = self
+        self._saved = []  # (owner, attribute, original) to put back in stop()
+        for cls, methods in INSTRUMENTED_METHODS.items():
+            for method in methods:
+                original = cls.__dict__[method]
+                self._saved.append((cls, method, original))
+                setattr(cls, method, self._wrap(f"{cls.__name__}.{method}", original))
+        for function in INSTRUMENTED_FUNCTIONS:
+            original = getattr(selection, function)
+            self._saved.append((selection, function, original))
+            setattr(selection, function, self._wrap(function, original))
+        self._saved.append((selection, "partition", selection.partition))
+        selection.partition = self._wrap("partition", self._counting_partition(selection.partition))
+
+    def stop(self):
+        """ Removes the wrappers, restoring the original methods and functions. """
+        if Profiler._active is not self:
+            return
+        for owner, attribute, original in reversed(self._saved):
+            setattr(owner, attribute, original)
+        Profiler._active = None
+
+    def enabled(self):
+        """ Context manager that records everything run inside the with block. """
+        return _Enabled(self)
+
+    def stats(self):
+        """
+        Returns the recorded numbers as a dict:
+        "operations" maps each operation to its count, total and mean time in ns,
+        deepest nesting and latency histogram ({"<2^b ns": count}), and
+        "partition" holds the comparisons and swaps made by partition.
+        """
+        operations = {}
+        for name in sorted(self.counts):
+            operations[name] = {
+                "count": self.counts[name],
+                "total_ns": self.total_ns[name],
+                "mean_ns": self.total_ns[name] / self.counts[name],
+                "max_depth": self.max_depth.get(name, 0),
+                "latency_histogram": {f"<2^{bucket} ns": count
+                                      for bucket, count in sorted(self.histograms[name].items())},
+            }
+        return {
+            "operations": operations,
+            "partition": {"comparisons": self.comparisons, "swaps": self.swaps},
+        }
+
+    def to_json(self, path=None):
+        """ Returns stats() as a JSON string and also writes it to path if one is given. """
+        text = json.dumps(self.stats(), indent=2)
+        if path is not None:
+            with open(path, "w") as file:
+                file.write(text)
+        return text
+
+    def display(self):
+        """ Prints a summary table of the recorded operations. """
+        print(f"{'operation':<36}{'count':>10}{'mean ns':>12}{'max depth':>11}")
+        for name, info in self.stats()["operations"].items():
+            print(f"{name:<36}{info['count']:>10}{info['mean_ns']:>12.0f}{info['max_depth']:>11}")
+        print(f"partition comparisons: {self.comparisons}, swaps: {self.swaps}")
+
+
+class _Enabled:
+    """ The context manager returned by Profiler.enabled(). """
+    def __init__(self, profiler):
+        self.profiler = profiler
+
+    def __enter__(self):
+        self.profiler.start()
+        return self.profiler
+
+    def __exit__(self, *exc_info):
+        self.profiler.stop()
@@ -1,217 +1,443 @@
 """
-This Python script implements two algorithms to find the k-th smallest element in an array:
-1. Deterministic "Median of Medians" algorithm, which guarantees O(n) time complexity in the worst case.
-2. Randomized Quickselect algorithm, which has O(n) expected time complexity.
-
-The script also empirically compares their performance on different input sizes and distributions
-(random, sorted, reverse-sorted), and generates a graph to show the results, which is saved as an image.
-It also prints the results for review.
+This Python script empirically compares the selection algorithms in selection.py
+(deterministic Median of Medians, randomized Quickselect, introselect and multiselect)
+on different input sizes and distributions (random, sorted, reverse-sorted, few distinct
+values, duplicates, all-equal values, organ-pipe, Zipfian values and median-of-3 killers),
+and generates a graph to show the results, which is saved as an image.
+Every measurement is the median of repeated, warmed-up perf_counter_ns trials on inputs
+generated from fixed seeds. The results are printed for review and saved as JSON, and
+compare_results checks a new run against a saved one for regressions.
+The selection functions are re-exported here, but new code should import them from
+selection.py, which loads much faster. Importing this module doesn't run anything either;
+matplotlib is only imported when a plot is drawn.
+Run "python3 medians.py --help" for the options.
 """
 
+import argparse
+import csv
+import functools
+import gc
+import json
+import os
+import platform
 import random
+import statistics
+import subprocess
+import sys
 import time
-import matplotlib.pyplot as plt
-
-# Deterministic Algorithm (Median of Medians)
-
-def partition(arr, low, high, pivot_index):
-    """
-    Partition the array around the chosen pivot index.
-    Moves all elements smaller than the pivot to its left
-    and all elements greater than the pivot to its right.
-    """
-    pivot_value = arr[pivot_index]  # Get the pivot value
-    arr[pivot_index], arr[high] = arr[high], arr[pivot_index]  # Move the pivot to the end
-    store_index = low  # Initialize the boundary between smaller and larger elements
-    
-    # Iterate through the array to rearrange elements
-    for i in range(low, high):
-        if arr[i] < pivot_value:  # If the current element is smaller than the pivot, swap it
-            arr[i], arr[store_index] = arr[store_index], arr[i]  # Swap with the boundary element
-            store_index += 1  # Move the boundary up
-    
-    arr[store_index], arr[high] = arr[high], arr[store_index]  # Move the pivot to its final place
-    return store_index  # Return the final pivot position
-
-def select_median_of_medians(arr, low, high, k):
-    """
-    Recursively selects the k-th smallest element using the Median of Medians algorithm.
-    Divides the array into groups of 5, finds the median of each group,
-    and then recursively finds the median of the medians.
-    """
-    if low == high:  # Base case: if there's only one element, return it
-        return arr[low]
-    
-    # Step 1: Divide the array into groups of 5 and find the median of each group
-    medians = []  # List to store the medians of groups
-    for i in range(low, high + 1, 5):
-        group = sorted(arr[i: min(i + 5, high + 1)])  # Sort each group of 5 elements
-        medians.append(group[len(group) // 2])  # Add the median of the group to the medians list
-
-    # Step 2: Find the median of the medians recursively
-    if len(medians) == 1:  # If there's only one median, use it as the pivot
-        median_of_medians = medians[0]
-    else:
-        median_of_medians = select_median_of_medians(medians, 0, len(medians) - 1, len(medians) // 2)
-
-    # Step 3: Find the index of the median of medians in the original array
-    pivot_index = arr.index(median_of_medians, low, high + 1)
-    
-    # Step 4: Partition the array around the median of medians
-    pivot_index = partition(arr, low, high, pivot_index)
 
-    # Step 5: Recursively select the k-th smallest element
-    if k == pivot_index:  # If the pivot is the k-th element, return it
-        return arr[k]
-    elif k < pivot_index:  # If k-th element is on the left, recurse on the left
-        return select_median_of_medians(arr, low, pivot_index - 1, k)
-    else:  # If k-th element is on the right, recurse on the right
-        return select_median_of_medians(arr, pivot_index + 1, high, k)
+try:
+    import numpy as np  # Optional: enables the vectorized selection backend in the benchmarks
+except ImportError:
+    np = None
+
+from selection import (
+    INTROSELECT_MAX_BAD_ROUNDS,
+    NUMPY_MIN_SIZE,
+    deterministic_select,
+    introselect,
+    multiselect,
+    numpy_randomized_select,
+    numpy_select_median_of_medians,
+    partition,
+    partition_random,
+    randomized_quickselect,
+    randomized_select,
+    select_median_of_medians,
+)
+from instrumentation import Profiler
 
-def deterministic_select(arr, k):
-    """
-    Wrapper function to call the Median of Medians algorithm.
-    It adjusts the k index to zero-based and initiates the selection process.
-    """
-    return select_median_of_medians(arr, 0, len(arr) - 1, k - 1)  # Adjust k for zero-based indexing
 
+# Empirical Comparison
 
-# Randomized Algorithm (Quickselect)
+TIMING_REPEATS = 5  # Timed trials per measurement
+TIMING_WARMUP = 1  # Untimed runs first, so caches and allocators settle
 
-def partition_random(arr, low, high):
+def measure_time(func, arr, k, repeats=TIMING_REPEATS, warmup=TIMING_WARMUP):
     """
-    Randomly selects a pivot and partitions the array around it.
-    Moves elements smaller than the pivot to the left and larger to the right.
+    Measures the execution time of the provided function (deterministic or randomized).
+    Runs it warmup times untimed and then repeats times timed with
+    time.perf_counter_ns, each run on a fresh copy of the array (the copy is made
+    outside the timed region) and with garbage collection paused.
+    Returns a dict with the median, quartiles, IQR and minimum in nanoseconds.
+    Raises ValueError if repeats is less than 1.
     """
-    pivot_index = random.randint(low, high)  # Choose a random pivot index
-    arr[pivot_index], arr[high] = arr[high], arr[pivot_index]  # Move the pivot to the end
-    pivot = arr[high]  # Set the pivot to the value at the high index
-    i = low - 1  # Initialize the boundary for smaller elements
-    
-    # Rearrange elements based on the pivot
-    for j in range(low, high):
-        if arr[j] <= pivot:  # If the element is smaller than or equal to the pivot
-            i += 1
-            arr[i], arr[j] = arr[j], arr[i]  # Swap it with the boundary element
-    
-    arr[i + 1], arr[high] = arr[high], arr[i + 1]  # Place the pivot in its final position
-    return i + 1  # Return the final pivot position
+    if repeats < 1:
+        raise ValueError(f"repeats must be at least 1, got {repeats}")
+    for _ in range(warmup):
+        func(arr.copy(), k)
+    times = []
+    for _ in range(repeats):
+        data = arr.copy()  # Use a copy of the array to avoid side effects
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            start_time = time.perf_counter_ns()  # Start the timer
+            func(data, k)
+            times.append(time.perf_counter_ns() - start_time)  # Stop the timer
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+    if len(times) > 1:
+        q1, median, q3 = statistics.quantiles(times, n=4, method="inclusive")
+    else:
+        q1 = median = q3 = times[0]
+    return {"median_ns": median, "q1_ns": q1, "q3_ns": q3, "iqr_ns": q3 - q1,
+            "min_ns": min(times), "repeats": repeats}
 
-def randomized_select(arr, low, high, k):
+def zipf_values(size, distinct=1000, exponent=1.0, rng=random):
     """
-    Recursively selects the k-th smallest element using the Randomized Quickselect algorithm.
-    Randomly selects a pivot and partitions based on the pivot.
+    Draws size values from 0..distinct-1 where value r has probability
+    proportional to 1 / (r + 1)^exponent, so a few values repeat very often
+    (like latency buckets or popular keys).
     """
-    if low == high:  # Base case: if there's only one element, return it
-        return arr[low]
-    
-    # Partition the array using a randomly chosen pivot
-    pivot_index = partition_random(arr, low, high)
-    
-    # Recursively select the k-th smallest element
-    if pivot_index == k:  # If the pivot is the k-th element, return it
-        return arr[pivot_index]
-    elif k < pivot_index:  # If k-th element is on the left, recurse on the left
-        return randomized_select(arr, low, pivot_index - 1, k)
-    else:  # If k-th element is on the right, recurse on the right
-        return randomized_select(arr, pivot_index + 1, high, k)
-
-def randomized_quickselect(arr, k):
+    weights = [1 / (rank + 1) ** exponent for rank in range(distinct)]
+    return rng.choices(range(distinct), weights=weights, k=size)
+
+def organ_pipe(size):
+    """ Rises from 0 to size // 2 and falls back again, e.g. 0 1 2 3 2 1. """
+    return list(range((size + 1) // 2)) + list(range(size // 2 - 1, -1, -1))
+
+
+KILLER_MAX_SIZE = 2000  # median_of_three_killer takes quadratic time to build
+
+# Input distributions used by run_benchmarks and plot_comparison (name -> generator(size, rng))
+COMPARISON_DISTRIBUTIONS = {
+    "Random": lambda size, rng: rng.sample(range(size * 2), size),
+    "Sorted": lambda size, rng: sorted(rng.sample(range(size * 2), size)),
+    "Reverse-Sorted": lambda size, rng: sorted(rng.sample(range(size * 2), size), reverse=True),
+    "Few Distinct": lambda size, rng: [rng.randint(0, 9) for _ in range(size)],
+    "Duplicates": lambda size, rng: [rng.randrange(max(1, size // 10)) for _ in range(size)],
+    "All Equal": lambda size, rng: [42] * size,
+    "Organ Pipe": lambda size, rng: organ_pipe(size),
+    "Zipfian": lambda size, rng: zipf_values(size, rng=rng),
+    "Median-of-3 Killer": lambda size, rng: median_of_three_killer(size) if size <= KILLER_MAX_SIZE else None,
+}
+
+# Selection functions compared by run_benchmarks (name -> function(arr, k))
+BENCHMARK_ALGORITHMS = {
+    "deterministic": functools.partial(deterministic_select, backend="python"),
+    "randomized": functools.partial(randomized_quickselect, backend="python"),
+    "introselect": introselect,
+}
+if np is not None:
+    BENCHMARK_ALGORITHMS["deterministic (numpy)"] = functools.partial(deterministic_select, backend="numpy")
+    BENCHMARK_ALGORITHMS["randomized (numpy)"] = functools.partial(randomized_quickselect, backend="numpy")
+
+BENCHMARK_SIZES = (1000, 10000, 100000)  # Up to 10**7 works, but the pure-Python runs get slow
+
+
+def run_benchmarks(sizes=BENCHMARK_SIZES, distributions=None, algorithms=None, repeats=TIMING_REPEATS,
+                   warmup=TIMING_WARMUP, seed=0, time_limit=None, profile=False):
     """
-    Wrapper function to initiate the Randomized Quickselect algorithm.
-    Adjusts k for zero-based indexing and calls the recursive function.
+    Times every algorithm on every distribution and size, finding the median (k = size // 2).
+    distributions and algorithms are lists of names from COMPARISON_DISTRIBUTIONS and
+    BENCHMARK_ALGORITHMS (all of them by default). Each input is generated from a
+    random.Random seeded with seed, the distribution and the size, so reruns see the
+    same data. Every result is checked against sorted().
+    An algorithm whose median time exceeds time_limit seconds is skipped for the
+    larger sizes of that distribution.
+    With profile=True, the untimed correctness run is made under an instrumentation
+    Profiler and each result also gets the partition comparisons and swaps, the
+    number of partition calls and the deepest recursion, which help explain the timings.
+    Returns one dict per measurement (see measure_time), ready for write_results.
     """
-    return randomized_select(arr, 0, len(arr) - 1, k - 1)  # Adjust k to zero-based indexing
-
-
-# Print results for initial example
-arr = [12, 3, 5, 7, 19, 26, 4, 9]  # Example array
-k = 4  # We want the 4th smallest element
-print(f"The {k}th smallest element using deterministic implementation is {deterministic_select(arr, k)}")
-print(f"The {k}th smallest element using randomized implementation is {randomized_quickselect(arr, k)}")
+    distributions = list(distributions or COMPARISON_DISTRIBUTIONS)
+    algorithms = list(algorithms or BENCHMARK_ALGORITHMS)
+    results = []
+    for name in distributions:
+        too_slow = set()
+        for size in sorted(sizes):
+            arr = COMPARISON_DISTRIBUTIONS[name](size, random.Random(f"{seed}-{name}-{size}"))
+            if arr is None:
+                continue  # This distribution can't be built at this size
+            k = size // 2  # Find the median (middle element)
+            expected = sorted(arr)[k - 1]
+            for algorithm in algorithms:
+                if algorithm in too_slow:
+                    continue
+                select = BENCHMARK_ALGORITHMS[algorithm]
+                profiler = Profiler() if profile else None
+                if profiler is not None:
+                    with profiler.enabled():
+                        result = select(arr.copy(), k)
+                else:
+                    result = select(arr.copy(), k)
+                if result != expected:
+                    raise AssertionError(f"{algorithm} gave a wrong answer on {name} (size {size})")
+                timing = measure_time(select, arr, k, repeats=repeats, warmup=warmup)
+                results.append({"algorithm": algorithm, "distribution": name, "size": size,
+                                "k": k, "seed": seed, **timing})
+                if profiler is not None:
+                    results[-1].update(comparisons=profiler.comparisons, swaps=profiler.swaps,
+                                       partitions=profiler.counts.get("partition", 0),
+                                       max_depth=max(profiler.max_depth.values(), default=0))
+                if time_limit is not None and timing["median_ns"] > time_limit * 1e9:
+                    too_slow.add(algorithm)
+    return results
+
+
+def print_results(results):
+    """
+    Prints benchmark results as a table of median times with their IQR (and the
+    profiler counts when the results were made with profile=True).
+    """
+    profiled = bool(results) and "comparisons" in results[0]
+    extra = f"{'comparisons':>13}{'swaps':>11}{'depth':>7}" if profiled else ""
+    print(f"\n{'distribution':<20}{'size':>10}  {'algorithm':<24}{'median ms':>12}{'IQR ms':>10}" + extra)
+    for row in results:
+        extra = f"{row['comparisons']:>13}{row['swaps']:>11}{row['max_depth']:>7}" if profiled else ""
+        print(f"{row['distribution']:<20}{row['size']:>10}  {row['algorithm']:<24}"
+              f"{row['median_ns'] / 1e6:>12.3f}{row['iqr_ns'] / 1e6:>10.3f}" + extra)
 
 
-# Empirical Comparison
-
-def measure_time(func, arr, k):
+def write_results(results, path):
     """
-    Measures the execution time of the provided function (deterministic or randomized).
+    Saves benchmark results to path as JSON (if it ends in .json, together with the
+    Python and NumPy versions and the platform) or as CSV otherwise.
     """
-    start_time = time.time()  # Start the timer
-    func(arr.copy(), k)  # Call the selection function (use a copy of the array to avoid side effects)
-    end_time = time.time()  # Stop the timer
-    return end_time - start_time  # Return the time taken for execution
-
-def run_comparison():
+    if path.endswith(".json"):
+        document = {
+            "python": platform.python_version(),
+            "numpy": np.__version__ if np is not None else None,
+            "platform": platform.platform(),
+            "results": results,
+        }
+        with open(path, "w") as file:
+            json.dump(document, file, indent=2)
+        return
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=list(results[0]) if results else ["algorithm"])
+        writer.writeheader()
+        writer.writerows(results)
+
+
+def read_results(path):
+    """ Loads results saved by write_results (JSON or CSV). """
+    if path.endswith(".json"):
+        with open(path) as file:
+            return json.load(file)["results"]
+    with open(path, newline="") as file:
+        rows = list(csv.DictReader(file))
+    for row in rows:
+        for field in ("size", "k", "seed", "repeats", "comparisons", "swaps", "partitions", "max_depth"):
+            if field in row:
+                row[field] = int(row[field])
+        for field in ("median_ns", "q1_ns", "q3_ns", "iqr_ns", "min_ns"):
+            row[field] = float(row[field])
+    return rows
+
+
+def compare_results(baseline, current, threshold=0.10):
+    """
+    Compares two benchmark runs (lists of results or paths to saved results) and
+    prints the change in median time of every measurement they share.
+    A measurement counts as a regression when it got slower by more than threshold
+    (10% by default) and by more than the larger of the two IQRs, so ordinary noise
+    isn't reported. Returns the list of regressions.
+    """
+    if isinstance(baseline, str):
+        baseline = read_results(baseline)
+    if isinstance(current, str):
+        current = read_results(current)
+    before = {(row["algorithm"], row["distribution"], row["size"]): row for row in baseline}
+    regressions = []
+    print(f"\n{'distribution':<20}{'size':>10}  {'algorithm':<24}{'before ms':>11}{'after ms':>10}{'change':>9}")
+    for row in current:
+        key = (row["algorithm"], row["distribution"], row["size"])
+        if key not in before:
+            continue
+        old = before[key]
+        change = row["median_ns"] / old["median_ns"] - 1 if old["median_ns"] else 0.0
+        noise = max(row["iqr_ns"], old["iqr_ns"])
+        regressed = change > threshold and row["median_ns"] - old["median_ns"] > noise
+        if regressed:
+            regressions.append({**row, "baseline_median_ns": old["median_ns"], "change": change})
+        print(f"{row['distribution']:<20}{row['size']:>10}  {row['algorithm']:<24}"
+              f"{old['median_ns'] / 1e6:>11.3f}{row['median_ns'] / 1e6:>10.3f}{change:>+9.1%}"
+              + ("  REGRESSION" if regressed else ""))
+    return regressions
+
+
+def run_comparison(backend="python", sizes=(100, 1000, 5000, 10000, 20000)):
     """
     Compares the running times of the deterministic and randomized algorithms.
-    Tests on random, sorted, and reverse-sorted arrays with increasing input sizes.
+    Tests on every distribution in COMPARISON_DISTRIBUTIONS with increasing input
+    sizes, using run_benchmarks. backend is passed on to both algorithms.
+    Returns the sizes, the median times in seconds (one row per size, one column
+    per distribution, None where a distribution can't be built) and all results.
+    """
+    algorithms = ["deterministic", "randomized"]
+    if backend == "numpy":
+        algorithms = ["deterministic (numpy)", "randomized (numpy)"]
+    results = run_benchmarks(sizes=sizes, algorithms=algorithms)
+    print("\nComparison of Deterministic and Randomized Algorithms:")
+    print_results(results)
+
+    medians = {(row["algorithm"], row["distribution"], row["size"]): row["median_ns"] / 1e9 for row in results}
+    deterministic_times = [[medians.get((algorithms[0], name, size)) for name in COMPARISON_DISTRIBUTIONS]
+                           for size in sizes]
+    randomized_times = [[medians.get((algorithms[1], name, size)) for name in COMPARISON_DISTRIBUTIONS]
+                        for size in sizes]
+    return list(sizes), deterministic_times, randomized_times, results
+
+
+def run_multiselect_comparison(size=200000, quantiles=(0.5, 0.9, 0.99, 0.999)):
+    """
+    Compares multiselect against calling deterministic_select and
+    randomized_quickselect once per quantile (each call on a fresh copy),
+    on the pure-Python backend and, when available, the NumPy backend.
     """
-    input_sizes = [100, 1000, 5000, 10000, 20000]  # Different input sizes for testing
-    deterministic_times = []
-    randomized_times = []
+    arr = [random.random() for _ in range(size)]
+    ks = [max(1, int(q * size)) for q in quantiles]
+    backends = ["python"] + (["numpy"] if np is not None else [])
+    print(f"\nSelecting {len(ks)} quantiles {list(quantiles)} of {size} elements:\n")
+    for backend in backends:
+        start_time = time.perf_counter()
+        batch = multiselect(arr, ks, backend=backend)
+        batch_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        single = [deterministic_select(arr.copy(), k, backend=backend) for k in ks]
+        deterministic_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        single_random = [randomized_quickselect(arr.copy(), k, backend=backend) for k in ks]
+        randomized_time = time.perf_counter() - start_time
+
+        assert batch == single == single_random, "multiselect disagrees with single selection!"
+        print(f"{backend:>7} backend - multiselect: {batch_time:.4f}s, "
+              f"repeated deterministic: {deterministic_time:.4f}s, "
+              f"repeated randomized: {randomized_time:.4f}s")
+
+
+class _Gas:
+    """
+    Element used by median_of_three_killer. Its value is decided lazily by
+    McIlroy's adversary: "gas" (undecided) elements compare greater than every
+    decided ("solid") one, and when two gas elements meet, the likely pivot is
+    frozen to the next smallest value.
+    """
+    def __init__(self, adversary):
+        self.adversary = adversary
+        self.value = None  # None while still gas
+
+    def __lt__(self, other):
+        return self.adversary.compare(self, other) < 0
 
-    for size in input_sizes:
-        arr_random = random.sample(range(size * 2), size)  # Generate a random array
-        arr_sorted = sorted(arr_random)  # Generate a sorted version of the array
-        arr_reverse_sorted = arr_sorted[::-1]  # Generate a reverse-sorted version of the array
-        k = size // 2  # Find the median (middle element)
+    def __gt__(self, other):
+        return self.adversary.compare(self, other) > 0
 
-        # Measure time for deterministic algorithm on random, sorted, and reverse-sorted arrays
-        deterministic_times.append([
-            measure_time(deterministic_select, arr_random, k),
-            measure_time(deterministic_select, arr_sorted, k),
-            measure_time(deterministic_select, arr_reverse_sorted, k)
-        ])
 
-        # Measure time for randomized algorithm on random, sorted, and reverse-sorted arrays
-        randomized_times.append([
-            measure_time(randomized_quickselect, arr_random, k),
-            measure_time(randomized_quickselect, arr_sorted, k),
-            measure_time(randomized_quickselect, arr_reverse_sorted, k)
-        ])
+class _McIlroyAdversary:
+    def __init__(self, size):
+        self.gas_value = size  # Larger than every solid value
+        self.next_solid = 0
+        self.candidate = None  # Gas element most recently seen in a comparison
 
-    # Print out the timing results for each case
-    print("\nComparison of Deterministic and Randomized Algorithms:\n")
-    for i, size in enumerate(input_sizes):
-        print(f"Input Size: {size}")
-        print(f"Deterministic - Random: {deterministic_times[i][0]:.6f}s, Sorted: {deterministic_times[i][1]:.6f}s, Reverse: {deterministic_times[i][2]:.6f}s")
-        print(f"Randomized - Random: {randomized_times[i][0]:.6f}s, Sorted: {randomized_times[i][1]:.6f}s, Reverse: {randomized_times[i][2]:.6f}s")
-        print()
+    def freeze(self, element):
+        element.value = self.next_solid
+        self.next_solid += 1
 
-    return input_sizes, deterministic_times, randomized_times
+    def compare(self, x, y):
+        if x.value is None and y.value is None:
+            self.freeze(x if x is self.candidate else y)
+        if x.value is None:
+            self.candidate = x
+        elif y.value is None:
+            self.candidate = y
+        x_value = self.gas_value if x.value is None else x.value
+        y_value = self.gas_value if y.value is None else y.value
+        return x_value - y_value
 
 
-def plot_comparison():
+def median_of_three_killer(size):
     """
-    Plots the comparison of the running times of the two algorithms.
-    Saves the plot as an image file and prints the results to the console.
+    Builds a median-of-3 killer: a permutation of range(size) on which
+    introselect's median-of-3 pivots are as bad as possible for finding the
+    median. It is generated with McIlroy's adversary ("A Killer Adversary for
+    Quicksort") by running introselect without its fallback on lazily valued
+    elements, which takes quadratic time, so keep size in the thousands.
     """
-    input_sizes, deterministic_times, randomized_times = run_comparison()
+    adversary = _McIlroyAdversary(size)
+    elements = [_Gas(adversary) for _ in range(size)]
+    introselect(elements.copy(), size // 2, max_bad_rounds=size)  # Never fall back
+    for element in elements:
+        if element.value is None:
+            adversary.freeze(element)  # Whatever was never compared gets the remaining values
+    return [element.value for element in elements]
 
-    # Extract times for different distributions
-    random_deterministic = [times[0] for times in deterministic_times]
-    sorted_deterministic = [times[1] for times in deterministic_times]
-    reverse_deterministic = [times[2] for times in deterministic_times]
 
-    random_randomized = [times[0] for times in randomized_times]
-    sorted_randomized = [times[1] for times in randomized_times]
-    reverse_randomized = [times[2] for times in randomized_times]
-
-    # Plot the results
-    plt.figure(figsize=(10, 6))
-    
-    # Random array
-    plt.plot(input_sizes, random_deterministic, label="Deterministic (Random Array)", marker="o")
-    plt.plot(input_sizes, random_randomized, label="Randomized (Random Array)", marker="o")
+def run_adversarial_comparison(sizes=(250, 500, 1000, 2000), time_limit=1.0):
+    """
+    Times introselect against the recursive deterministic_select and
+    randomized_quickselect (pure-Python backend) on inputs that are hard for
+    quickselect: all-equal values, few distinct values, sorted and
+    median-of-3 killer arrays. "no fallback" is introselect with its
+    median-of-medians fallback switched off, to show what the fallback saves.
+    A recursive function that runs out of stack is reported as RecursionError,
+    and a function that took longer than time_limit seconds is skipped for the
+    larger sizes of that input.
+    """
+    contenders = {
+        "deterministic": lambda arr, k: deterministic_select(arr, k, backend="python"),
+        "randomized": lambda arr, k: randomized_quickselect(arr, k, backend="python"),
+        "introselect": introselect,
+        "introselect rnd": lambda arr, k: introselect(arr, k, pivot_rule="random"),
+        "no fallback": lambda arr, k: introselect(arr, k, max_bad_rounds=len(arr)),  # Median-of-3 only
+    }
+    print("\nAdversarial inputs (k = size // 2):\n")
+    print(f"{'input':<18}{'size':>6}" + "".join(f"{name:>17}" for name in contenders))
+    for label in ("all equal", "few distinct", "sorted", "median-3 killer"):
+        too_slow = set()
+        for size in sizes:
+            arr = {
+                "all equal": lambda: [7] * size,
+                "few distinct": lambda: [random.randint(0, 3) for _ in range(size)],
+                "sorted": lambda: list(range(size)),
+                "median-3 killer": lambda: median_of_three_killer(size),
+            }[label]()
+            k = size // 2
+            expected = sorted(arr)[k - 1]
+            cells = []
+            for name, select in contenders.items():
+                if name in too_slow:
+                    cells.append("skipped")
+                    continue
+                try:
+                    start_time = time.perf_counter()
+                    result = select(arr.copy(), k)
+                    elapsed = time.perf_counter() - start_time
+                    assert result == expected, f"{name} gave a wrong answer on {label}"
+                    cells.append(f"{elapsed:.4f}s")
+                    if elapsed > time_limit:
+                        too_slow.add(name)
+                except RecursionError:
+                    cells.append("RecursionError")
+            print(f"{label:<18}{size:>6}" + "".join(f"{cell:>17}" for cell in cells))
+
+
+def plot_comparison(results_path="algorithm_comparison.json"):
+    """
+    Plots the comparison of the running times of the two algorithms (median of
+    repeated trials). Saves the plot as an image file, saves the raw results to
+    results_path (JSON or CSV, see write_results) and prints them to the console.
+    """
+    import matplotlib.pyplot as plt  # Imported here so the rest of the module loads without it
 
-    # Sorted array
-    plt.plot(input_sizes, sorted_deterministic, label="Deterministic (Sorted Array)", linestyle="--", marker="x")
-    plt.plot(input_sizes, sorted_randomized, label="Randomized (Sorted Array)", linestyle="--", marker="x")
+    input_sizes, deterministic_times, randomized_times, results = run_comparison()
+    write_results(results, results_path)
 
-    # Reverse sorted array
-    plt.plot(input_sizes, reverse_deterministic, label="Deterministic (Reverse-Sorted Array)", linestyle=":", marker="s")
-    plt.plot(input_sizes, reverse_randomized, label="Randomized (Reverse-Sorted Array)", linestyle=":", marker="s")
+    # Plot the results: one line style per distribution, one color per algorithm
+    plt.figure(figsize=(10, 6))
+    styles = [("-", "o"), ("--", "x"), (":", "s"), ("-.", "^"), ("--", "d"), (":", "v")]
+    for column, name in enumerate(COMPARISON_DISTRIBUTIONS):
+        linestyle, marker = styles[column % len(styles)]
+        for label, color, times in (("Deterministic", "tab:blue", deterministic_times),
+                                    ("Randomized", "tab:orange", randomized_times)):
+            column_times = [float("nan") if row[column] is None else row[column] for row in times]
+            plt.plot(input_sizes, column_times, color=color,
+                     label=f"{label} ({name} Array)", linestyle=linestyle, marker=marker)
 
     # Formatting the plot
     plt.xlabel("Input Size")
@@ -224,6 +450,81 @@ def plot_comparison():
     plt.savefig("algorithm_comparison.png")
     plt.show()
 
-# Call this function to plot and save the comparison graph and print results
-plot_comparison()
+def measure_import_time(module="selection", repeats=5):
+    """
+    Measures how long importing module takes in a fresh interpreter (so nothing
+    is cached yet), repeats times, and returns the median in seconds.
+    """
+    code = ("import time; start = time.perf_counter_ns(); "
+            f"import {module}; print(time.perf_counter_ns() - start)")
+    here = os.path.dirname(os.path.abspath(__file__))  # So the module is found from any directory
+    times = [int(subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                check=True, cwd=here).stdout) for _ in range(repeats)]
+    return statistics.median(times) / 1e9
+
+
+def main(argv=None):
+    """
+    Command line entry point. Without options it prints the example, runs the
+    comparison and saves the graph, like earlier versions of this script did.
+    """
+    parser = argparse.ArgumentParser(description="Benchmarks for the selection algorithms in selection.py")
+    parser.add_argument("--sizes", type=int, nargs="+", help="input sizes for a full benchmark run (up to 10**7)")
+    parser.add_argument("--distributions", nargs="+", choices=list(COMPARISON_DISTRIBUTIONS))
+    parser.add_argument("--algorithms", nargs="+", choices=list(BENCHMARK_ALGORITHMS))
+    parser.add_argument("--repeats", type=int, default=TIMING_REPEATS)
+    parser.add_argument("--warmup", type=int, default=TIMING_WARMUP)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--time-limit", type=float, help="skip larger sizes once a run takes this many seconds")
+    parser.add_argument("--output", default="algorithm_comparison.json", help="results file (.json or .csv)")
+    parser.add_argument("--profile", action="store_true", help="add comparison/swap/depth counts to the results")
+    parser.add_argument("--compare", metavar="BASELINE", help="saved results to check the new ones against")
+    parser.add_argument("--import-time", action="store_true", help="only measure how long the imports take")
+    parser.add_argument("--multiselect", action="store_true",
+                        help="only compare multiselect with repeated single selections (one run per --sizes value)")
+    parser.add_argument("--adversarial", action="store_true",
+                        help="only time introselect against the recursive algorithms on adversarial inputs "
+                             "(--sizes in the thousands, --time-limit skips slow ones)")
+    args = parser.parse_args(argv)
+
+    if args.import_time:
+        for module in ("selection", "medians"):
+            print(f"import {module}: {measure_import_time(module) * 1000:.1f} ms")
+        return
+
+    if args.multiselect:
+        random.seed(args.seed)
+        for size in args.sizes or [200000]:
+            run_multiselect_comparison(size)
+        return
+
+    if args.adversarial:
+        random.seed(args.seed)
+        run_adversarial_comparison(sizes=args.sizes or (250, 500, 1000, 2000),
+                                   time_limit=args.time_limit if args.time_limit is not None else 1.0)
+        return
+
+    if args.sizes is None and args.distributions is None and args.algorithms is None:
+        # Print results for initial example
+        arr = [12, 3, 5, 7, 19, 26, 4, 9]  # Example array
+        k = 4  # We want the 4th smallest element
+        print(f"The {k}th smallest element using deterministic implementation is {deterministic_select(arr, k)}")
+        print(f"The {k}th smallest element using randomized implementation is {randomized_quickselect(arr, k)}")
+        # Plot and save the comparison graph and print results
+        plot_comparison(args.output)
+        results = read_results(args.output)
+    else:
+        results = run_benchmarks(sizes=args.sizes or BENCHMARK_SIZES, distributions=args.distributions,
+                                 algorithms=args.algorithms, repeats=args.repeats, warmup=args.warmup,
+                                 seed=args.seed, time_limit=args.time_limit, profile=args.profile)
+        print_results(results)
+        write_results(results, args.output)
+
+    if args.compare:
+        regressions = compare_results(args.compare, results)
+        print(f"\n{len(regressions)} regression(s) found")
+
+
+if __name__ == "__main__":
+    main()
 
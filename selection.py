@@ -0,0 +1,345 @@
+"""
+This Python module implements algorithms to find the k-th smallest element in an array:
+1. Deterministic "Median of Medians" algorithm, which guarantees O(n) time complexity in the worst case.
+2. Randomized Quickselect algorithm, which has O(n) expected time complexity.
+Both algorithms partition three ways (less / equal / greater than the pivot) and stop as soon
+as k falls among the elements equal to the pivot, so inputs with many duplicates stay fast.
+Both can also run on a vectorized NumPy backend (when NumPy is installed) that does the
+group-of-5 medians and the partitions with array operations instead of Python loops.
+
+introselect combines the two: an iterative quickselect that falls back to median-of-medians
+pivots when partitioning stops making progress.
+multiselect finds several order statistics (e.g. p50, p90, p99) in a single partitioning pass.
+
+Importing it has no side effects and only needs the standard library; NumPy is imported
+the first time a call uses the NumPy backend. The benchmarks and plots are in medians.py.
+"""
+
+import random
+
+np = None  # Set by _load_numpy on first use of the NumPy backend
+_numpy_checked = False
+
+# Deterministic Algorithm (Median of Medians)
+
+def partition(arr, low, high, pivot):
+    """
+    Three-way (Dutch national flag) partition of arr[low..high] around the pivot value.
+    Moves all elements smaller than the pivot to the left, all elements equal
+    to it to the middle and all elements greater than it to the right.
+    Returns (lt, gt), the first and last index of the band equal to the pivot.
+    Keeping the equal elements together is what makes inputs with many
+    duplicate values split evenly instead of piling up on one side.
+    """
+    lt, i, gt = low, low, high  # arr[low..lt-1] < pivot, arr[lt..i-1] == pivot, arr[gt+1..high] > pivot
+    while i <= gt:
+        value = arr[i]
+        if value < pivot:  # Grow the "less" band and move on
+            arr[lt], arr[i] = value, arr[lt]
+            lt += 1
+            i += 1
+        elif value > pivot:  # Send it to the "greater" band; arr[i] is new, so don't advance
+            arr[gt], arr[i] = value, arr[gt]
+            gt -= 1
+        else:
+            i += 1
+    return lt, gt
+
+def select_median_of_medians(arr, low, high, k):
+    """
+    Recursively selects the k-th smallest element using the Median of Medians algorithm.
+    Divides the array into groups of 5, finds the median of each group,
+    and then recursively finds the median of the medians.
+    """
+    if low == high:  # Base case: if there's only one element, return it
+        return arr[low]
+    
+    # Step 1: Divide the array into groups of 5 and find the median of each group
+    medians = []  # List to store the medians of groups
+    for i in range(low, high + 1, 5):
+        group = sorted(arr[i: min(i + 5, high + 1)])  # Sort each group of 5 elements
+        medians.append(group[len(group) // 2])  # Add the median of the group to the medians list
+
+    # Step 2: Find the median of the medians recursively
+    if len(medians) == 1:  # If there's only one median, use it as the pivot
+        median_of_medians = medians[0]
+    else:
+        median_of_medians = select_median_of_medians(medians, 0, len(medians) - 1, len(medians) // 2)
+
+    # Step 3: Partition the array three ways around the median of medians
+    lt, gt = partition(arr, low, high, median_of_medians)
+
+    # Step 4: Recursively select the k-th smallest element
+    if lt <= k <= gt:  # If k falls among the copies of the pivot, we're done
+        return median_of_medians
+    elif k < lt:  # If k-th element is on the left, recurse on the left
+        return select_median_of_medians(arr, low, lt - 1, k)
+    else:  # If k-th element is on the right, recurse on the right
+        return select_median_of_medians(arr, gt + 1, high, k)
+
+def deterministic_select(arr, k, backend="auto"):
+    """
+    Wrapper function to call the Median of Medians algorithm.
+    It adjusts the k index to zero-based and initiates the selection process.
+    backend picks the implementation: "python" (the in-place version above),
+    "numpy" (vectorized, leaves arr untouched) or "auto", which uses NumPy
+    when it is installed and the input is at least NUMPY_MIN_SIZE plain numbers
+    (see _numpy_values).
+    """
+    values = _numpy_values(arr, backend)
+    if values is not None:
+        return numpy_select_median_of_medians(values, k - 1)
+    return select_median_of_medians(arr, 0, len(arr) - 1, k - 1)  # Adjust k for zero-based indexing
+
+
+# Randomized Algorithm (Quickselect)
+
+def partition_random(arr, low, high):
+    """
+    Randomly selects a pivot and partitions the array three ways around it.
+    Returns (lt, gt), the band of elements equal to the pivot.
+    """
+    pivot = arr[random.randint(low, high)]  # Choose a random pivot value
+    return partition(arr, low, high, pivot)
+
+def randomized_select(arr, low, high, k):
+    """
+    Recursively selects the k-th smallest element using the Randomized Quickselect algorithm.
+    Randomly selects a pivot and partitions based on the pivot.
+    """
+    if low == high:  # Base case: if there's only one element, return it
+        return arr[low]
+    
+    # Partition the array using a randomly chosen pivot
+    lt, gt = partition_random(arr, low, high)
+    
+    # Recursively select the k-th smallest element
+    if lt <= k <= gt:  # If k falls among the copies of the pivot, return it
+        return arr[k]
+    elif k < lt:  # If k-th element is on the left, recurse on the left
+        return randomized_select(arr, low, lt - 1, k)
+    else:  # If k-th element is on the right, recurse on the right
+        return randomized_select(arr, gt + 1, high, k)
+
+def randomized_quickselect(arr, k, backend="auto"):
+    """
+    Wrapper function to initiate the Randomized Quickselect algorithm.
+    Adjusts k for zero-based indexing and calls the recursive function.
+    backend works the same way as in deterministic_select.
+    """
+    values = _numpy_values(arr, backend)
+    if values is not None:
+        return numpy_randomized_select(values, k - 1)
+    return randomized_select(arr, 0, len(arr) - 1, k - 1)  # Adjust k to zero-based indexing
+
+
+# Vectorized NumPy backend
+
+NUMPY_MIN_SIZE = 1000  # Below this, converting to an array costs more than it saves
+
+def _load_numpy():
+    """
+    Imports NumPy the first time a call needs it and returns it (None if it
+    isn't installed). Importing NumPy takes far longer than importing this
+    module, so code that only selects from small lists never pays for it.
+    """
+    global np, _numpy_checked
+    if not _numpy_checked:
+        _numpy_checked = True
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            np = None
+    return np
+
+def _numpy_values(arr, backend):
+    """
+    Decides whether a selection call should run on the NumPy backend and returns
+    arr as a NumPy array if so, or None for the pure-Python path.
+    In auto mode only plain one-dimensional numbers qualify: tuples, ints too
+    big for int64 (which NumPy stores as objects) and lists that mix ints with
+    floats (which NumPy would turn into floats) stay on the Python path, so the
+    answer is always one of the original elements.
+    """
+    if backend == "python":
+        return None
+    if backend == "numpy":
+        if _load_numpy() is None:
+            raise ImportError("The numpy backend needs NumPy to be installed")
+        return np.asarray(arr)
+    if backend != "auto":
+        raise ValueError(f"Unknown backend {backend!r}; use 'auto', 'python' or 'numpy'")
+    if len(arr) < NUMPY_MIN_SIZE or _load_numpy() is None:
+        return None
+    if isinstance(arr, np.ndarray):
+        values = arr
+    else:
+        try:
+            values = np.asarray(arr)
+        except (ValueError, TypeError, OverflowError):
+            return None  # Ragged or otherwise not array-like
+    if values.ndim != 1 or values.dtype.kind not in "iuf":
+        return None
+    if values.dtype.kind == "f" and values is not arr and not all(isinstance(value, float) for value in arr):
+        return None  # Some ints were promoted to floats
+    return values
+
+def _numpy_group_medians(values):
+    """
+    Returns the median of every group of 5 consecutive elements (the last group
+    may be shorter), computed for all groups at once by sorting the rows of a
+    (groups x 5) view of the array.
+    """
+    full = len(values) // 5 * 5
+    medians = np.sort(values[:full].reshape(-1, 5), axis=1)[:, 2]
+    if full < len(values):
+        tail = np.sort(values[full:])
+        medians = np.append(medians, tail[len(tail) // 2])
+    return medians
+
+def _numpy_narrow(values, k, pivot):
+    """
+    Three-way partitions values around pivot with boolean masks.
+    Returns (None, None) when the k-th smallest equals the pivot, otherwise the
+    side that contains it and k adjusted to that side.
+    """
+    less = values[values < pivot]
+    if k < len(less):
+        return less, k
+    equal_count = np.count_nonzero(values == pivot)
+    if k < len(less) + equal_count:
+        return None, None  # k lands among the copies of the pivot
+    return values[values > pivot], k - len(less) - equal_count
+
+def numpy_select_median_of_medians(values, k):
+    """
+    Median of Medians on a NumPy array, with k zero-based.
+    Same algorithm as select_median_of_medians, but the group medians and the
+    partition are computed with vectorized operations. The loop only shrinks
+    the array, so the input is never modified.
+    """
+    while len(values) > 5:
+        medians = _numpy_group_medians(values)
+        pivot = numpy_select_median_of_medians(medians, len(medians) // 2)
+        values, k = _numpy_narrow(values, k, pivot)
+        if values is None:
+            return pivot
+    return np.sort(values)[k].item()
+
+def numpy_randomized_select(values, k, rng=None):
+    """
+    Randomized Quickselect on a NumPy array, with k zero-based.
+    Each round picks a random pivot and keeps only the side containing k.
+    """
+    rng = rng if rng is not None else np.random.default_rng()
+    while len(values) > 5:
+        pivot = values[rng.integers(len(values))].item()
+        values, k = _numpy_narrow(values, k, pivot)
+        if values is None:
+            return pivot
+    return np.sort(values)[k].item()
+
+
+# Multi-k Selection (several order statistics in one pass)
+
+def multiselect(arr, ks, backend="auto"):
+    """
+    Returns the k-th smallest element for every k in ks (1-based, in the order given).
+    Partitions the array once around a random pivot and only descends into the
+    segments that still contain requested ranks, so m ranks cost about
+    O(n log m) instead of the O(n * m) of m separate selections.
+    Works on a copy; arr itself is not modified. backend works as in deterministic_select
+    (the NumPy version uses np.partition, which accepts many ranks at once).
+    """
+    ranks = [k - 1 for k in ks]  # Zero-based
+    if not ranks:
+        return []
+    values = _numpy_values(arr, backend)
+    if values is not None:
+        wanted = sorted(set(ranks))
+        partitioned = np.partition(values, wanted)
+        return [partitioned[rank].item() for rank in ranks]
+    values = list(arr)
+    found = {}
+    segments = [(0, len(values) - 1, sorted(set(ranks)))]  # (low, high, ranks inside) still to do
+    while segments:
+        low, high, wanted = segments.pop()
+        if high - low < 16:  # Small segment: sorting it answers every rank in it
+            values[low:high + 1] = sorted(values[low:high + 1])
+            for rank in wanted:
+                found[rank] = values[rank]
+            continue
+        pivot = values[random.randint(low, high)]
+        lt, gt = partition(values, low, high, pivot)
+        left = [rank for rank in wanted if rank < lt]
+        right = [rank for rank in wanted if rank > gt]
+        for rank in wanted:
+            if lt <= rank <= gt:
+                found[rank] = pivot  # Rank falls among the copies of the pivot
+        if left:
+            segments.append((low, lt - 1, left))
+        if right:
+            segments.append((gt + 1, high, right))
+    return [found[rank] for rank in ranks]
+
+
+# Introselect (quickselect with a median-of-medians safety net, no recursion)
+
+INTROSELECT_MAX_BAD_ROUNDS = 3  # Bad pivots tolerated before switching to median of medians
+
+def _median_of_three(arr, low, high):
+    """
+    Returns the median of the first, middle and last values of arr[low..high].
+    """
+    a, b, c = arr[low], arr[(low + high) // 2], arr[high]
+    if a < b:
+        return b if b < c else (c if a < c else a)
+    return a if a < c else (c if b < c else b)
+
+def _median_of_medians_pivot(arr, low, high):
+    """
+    Returns the median of the group-of-5 medians of arr[low..high], a pivot
+    that is guaranteed to have at least ~30% of the segment on each side.
+    The median of the medians is found with introselect itself, which nests
+    at most log5(n) calls even when every level falls back.
+    """
+    medians = []
+    for i in range(low, high + 1, 5):
+        group = sorted(arr[i: min(i + 5, high + 1)])
+        medians.append(group[len(group) // 2])
+    return introselect(medians, len(medians) // 2 + 1)
+
+def introselect(arr, k, pivot_rule="median3", max_bad_rounds=INTROSELECT_MAX_BAD_ROUNDS):
+    """
+    Finds the k-th smallest element (1-based) with an iterative quickselect.
+    Pivots come from pivot_rule ("median3" or "random") and each round keeps
+    only the three-way partition band that contains k, so duplicates end the
+    search early. A round that leaves more than 3/4 of the segment counts as
+    bad; after max_bad_rounds of them every later pivot is the
+    median of medians, which makes the worst case linear. There is no
+    recursion on the partitions, so adversarial inputs can't hit the
+    recursion limit. Like the other selection functions, it rearranges arr.
+    """
+    low, high = 0, len(arr) - 1
+    k -= 1  # Zero-based
+    bad_rounds = 0
+    while high - low >= 16:
+        size = high - low + 1
+        if bad_rounds >= max_bad_rounds:
+            pivot = _median_of_medians_pivot(arr, low, high)
+        elif pivot_rule == "random":
+            pivot = arr[random.randint(low, high)]
+        else:
+            pivot = _median_of_three(arr, low, high)
+        lt, gt = partition(arr, low, high, pivot)
+        if k < lt:
+            high = lt - 1
+        elif k > gt:
+            low = gt + 1
+        else:
+            return pivot  # k falls among the copies of the pivot
+        if high - low + 1 > size * 3 // 4:
+            bad_rounds += 1
+    arr[low:high + 1] = sorted(arr[low:high + 1])  # Small segment: finish with a sort
+    return arr[k]
@@ -0,0 +1,244 @@
+"""
+This Python script implements sparse matrices, which only store the nonzero cells:
+1. COOMatrix (coordinate list) for building a matrix one cell at a time
+2. CSRMatrix (compressed sparse rows) for fast row access and multiplication
+Memory is proportional to the number of nonzeros instead of rows x cols.
+Both convert to and from the dense MyMatrix in elementary_data_structures.py.
+Like MyMatrix, they use NumPy when it is installed and array.array otherwise.
+"""
+
+import array
+import bisect
+import operator
+
+from elementary_data_structures import MyMatrix, _TYPECODES, np
+
+
+class COOMatrix:
+    """
+    Sparse matrix stored as three parallel arrays: row index, column index, value.
+    Inserting just appends to the arrays, so building is O(1) per cell.
+    Cells inserted more than once are summed when converting to CSR or dense.
+    """
+    def __init__(self, rows, cols, dtype="float64"):
+        if dtype not in _TYPECODES:
+            raise ValueError(f"Unsupported dtype {dtype!r}")
+        self.rows = rows
+        self.cols = cols
+        self.dtype = dtype
+        # array.array appends are cheap; NumPy arrays would be copied on every append
+        self.row_indices = array.array("q")
+        self.col_indices = array.array("q")
+        self.values = array.array(_TYPECODES[dtype])
+
+    @property
+    def shape(self):
+        return (self.rows, self.cols)
+
+    @property
+    def nnz(self):
+        """ Number of stored entries (duplicates included). """
+        return len(self.values)
+
+    @property
+    def nbytes(self):
+        """ Bytes used by the three arrays. """
+        return sum(len(a) * a.itemsize for a in (self.row_indices, self.col_indices, self.values))
+
+    def insert(self, row, col, value):
+        """
+        Adds value at the specified row and column.
+        """
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            self.row_indices.append(row)
+            self.col_indices.append(col)
+            self.values.append(value)
+        else:
+            print("Row or column out of bounds!")
+
+    def insert_many(self, rows, cols, values):
+        """
+        Adds values[i] at (rows[i], cols[i]) for every i.
+        Nothing is added if any index is out of bounds.
+        """
+        rows, cols, values = list(rows), list(cols), list(values)
+        if not len(rows) == len(cols) == len(values):
+            print("Row, column and value lists must have the same length!")
+            return
+        if rows and (min(rows) < 0 or max(rows) >= self.rows or min(cols) < 0 or max(cols) >= self.cols):
+            print("Row or column out of bounds!")
+            return
+        self.row_indices.extend(rows)
+        self.col_indices.extend(cols)
+        self.values.extend(values)
+
+    @classmethod
+    def from_dense(cls, matrix):
+        """ Builds a COO matrix holding the nonzero cells of a MyMatrix. """
+        return CSRMatrix.from_dense(matrix).to_coo()
+
+    def to_csr(self):
+        """
+        Converts to CSR: sorts the entries by (row, col) and sums duplicates.
+        """
+        if np is not None:
+            rows = np.frombuffer(self.row_indices, dtype=np.int64)
+            cols = np.frombuffer(self.col_indices, dtype=np.int64)
+            values = np.frombuffer(self.values, dtype=self.dtype)
+            keys = rows * self.cols + cols  # One sortable key per cell
+            order = np.argsort(keys, kind="stable")
+            keys, values = keys[order], values[order]
+            starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]]) if len(keys) else np.empty(0, np.intp)
+            values = np.add.reduceat(values, starts) if len(keys) else values
+            keys = keys[starts]
+            indptr = np.zeros(self.rows + 1, dtype=np.int64)
+            np.cumsum(np.bincount(keys // self.cols, minlength=self.rows), out=indptr[1:])
+            return CSRMatrix(self.rows, self.cols, indptr, keys % self.cols, values.astype(self.dtype), self.dtype)
+        cells = {}
+        for row, col, value in zip(self.row_indices, self.col_indices, self.values):
+            cells[(row, col)] = cells.get((row, col), 0) + value
+        indptr = array.array("q", [0] * (self.rows + 1))
+        indices = array.array("q")
+        data = array.array(_TYPECODES[self.dtype])
+        for (row, col) in sorted(cells):
+            indptr[row + 1] += 1
+            indices.append(col)
+            data.append(cells[(row, col)])
+        for row in range(self.rows):
+            indptr[row + 1] += indptr[row]  # Counts -> running offsets
+        return CSRMatrix(self.rows, self.cols, indptr, indices, data, self.dtype)
+
+    def to_dense(self):
+        """ Converts to a dense MyMatrix. """
+        return self.to_csr().to_dense()
+
+
+class CSRMatrix:
+    """
+    Sparse matrix in compressed sparse row form.
+    indices and data hold the column index and value of every nonzero, row by
+    row, and row i occupies positions indptr[i] to indptr[i + 1] of them.
+    """
+    def __init__(self, rows, cols, indptr, indices, data, dtype="float64"):
+        self.rows = rows
+        self.cols = cols
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.dtype = dtype
+
+    @property
+    def shape(self):
+        return (self.rows, self.cols)
+
+    @property
+    def nnz(self):
+        """ Number of stored entries. """
+        return len(self.data)
+
+    @property
+    def nbytes(self):
+        """ Bytes used by the three arrays. """
+        if np is not None:
+            return self.indptr.nbytes + self.indices.nbytes + self.data.nbytes
+        return sum(len(a) * a.itemsize for a in (self.indptr, self.indices, self.data))
+
+    @classmethod
+    def from_dense(cls, matrix):
+        """ Builds a CSR matrix holding the nonzero cells of a MyMatrix. """
+        if np is not None:
+            dense = matrix._data
+            mask = dense != 0
+            indptr = np.zeros(matrix.rows + 1, dtype=np.int64)
+            np.cumsum(mask.sum(axis=1), out=indptr[1:])
+            return cls(matrix.rows, matrix.cols, indptr, np.nonzero(mask)[1].astype(np.int64),
+                       dense[mask], matrix.dtype)
+        indptr = array.array("q", [0])
+        indices = array.array("q")
+        data = array.array(_TYPECODES[matrix.dtype])
+        for row in range(matrix.rows):
+            for col, value in enumerate(matrix.row(row)):
+                if value != 0:
+                    indices.append(col)
+                    data.append(value)
+            indptr.append(len(data))
+        return cls(matrix.rows, matrix.cols, indptr, indices, data, matrix.dtype)
+
+    def to_coo(self):
+        """ Converts to a COO matrix. """
+        coo = COOMatrix(self.rows, self.cols, self.dtype)
+        for row in range(self.rows):
+            count = self.indptr[row + 1] - self.indptr[row]
+            coo.row_indices.extend([row] * count)
+        coo.col_indices.extend(self.indices.tolist())
+        coo.values.extend(self.data.tolist())
+        return coo
+
+    def to_dense(self):
+        """ Converts to a dense MyMatrix. """
+        dense = MyMatrix(self.rows, self.cols, dtype=self.dtype)
+        if np is not None:
+            row_ids = np.repeat(np.arange(self.rows), np.diff(self.indptr))
+            dense._data[row_ids, self.indices] = self.data
+            return dense
+        for row in range(self.rows):
+            for position in range(self.indptr[row], self.indptr[row + 1]):
+                dense._data[row * self.cols + self.indices[position]] = self.data[position]
+        return dense
+
+    def access(self, row, col):
+        """
+        Returns the value at the specified row and column (zero if it isn't stored).
+        Uses a binary search within the row, so it is O(log nonzeros in the row).
+        """
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return "Row or column out of bounds!"
+        start, end = self.indptr[row], self.indptr[row + 1]
+        position = bisect.bisect_left(self.indices, col, start, end)
+        if position < end and self.indices[position] == col:
+            value = self.data[position]
+            return value.item() if np is not None else value
+        return 0
+
+    def row(self, index):
+        """ Returns the (column indices, values) of the nonzeros in one row. """
+        start, end = self.indptr[index], self.indptr[index + 1]
+        return self.indices[start:end], self.data[start:end]
+
+    def matvec(self, vector):
+        """ Returns the product of this matrix and a vector of length cols. """
+        if len(vector) != self.cols:
+            raise ValueError(f"Can't multiply {self.shape} matrix by a vector of length {len(vector)}")
+        if np is not None:
+            products = self.data * np.asarray(vector)[self.indices]
+            row_ids = np.repeat(np.arange(self.rows), np.diff(self.indptr))
+            return np.bincount(row_ids, weights=products, minlength=self.rows).astype(np.float64, copy=False)
+        result = array.array("d")
+        for row in range(self.rows):
+            start, end = self.indptr[row], self.indptr[row + 1]
+            result.append(sum(self.data[p] * vector[self.indices[p]] for p in range(start, end)))
+        return result
+
+    def matmul(self, other):
+        """ Returns the product of this matrix and a dense MyMatrix, as a dense MyMatrix. """
+        if self.cols != other.rows:
+            raise ValueError(f"Can't multiply {self.shape} by {other.shape} matrices")
+        product = MyMatrix(self.rows, other.cols, dtype="float64")
+        if np is not None:
+            for row in range(self.rows):
+                start, end = self.indptr[row], self.indptr[row + 1]
+                if start != end:
+                    # Weighted sum of the dense rows picked out by this row's nonzeros
+                    product._data[row] = self.data[start:end] @ other._data[self.indices[start:end]]
+            return product
+        for row in range(self.rows):
+            total = [0.0] * other.cols
+            for position in range(self.indptr[row], self.indptr[row + 1]):
+                weight = self.data[position]
+                dense_row = other.row(self.indices[position])
+                total = list(map(operator.add, total, (weight * value for value in dense_row)))
+            product._data[row * other.cols:(row + 1) * other.cols] = array.array("d", total)
+        return product
+
+    def __matmul__(self, other):
+        return self.matmul(other)
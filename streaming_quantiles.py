@@ -0,0 +1,257 @@
+"""
+This Python script implements median and quantile tracking for unbounded streams,
+where the selection functions in selection.py can't be used because they need the
+whole array in memory:
+1. RunningMedian keeps the exact median of everything seen so far using two heaps
+   (O(log n) per element, but it stores every element).
+2. KLLSketch (Karnin, Lang and Liberty's quantile sketch) keeps a bounded sample of
+   weighted elements and answers any quantile approximately. Its memory depends
+   only on the accuracy parameter k, and sketches built on separate shards of the
+   data can be merged into one.
+Both accept elements one at a time (add) or from any iterable or iterator (add_many).
+Run "python3 streaming_quantiles.py" to compare their accuracy and throughput with
+the exact deterministic_select.
+"""
+
+import bisect
+import heapq
+import math
+import random
+import time
+
+from selection import deterministic_select
+
+
+class RunningMedian:
+    """
+    Exact running median with two heaps.
+    The lower half of the elements sits in a max-heap (stored negated, since heapq
+    is a min-heap) and the upper half in a min-heap. The heaps are kept balanced
+    so the lower heap has the same number of elements as the upper one, or one more.
+    """
+    def __init__(self):
+        self._lower = []  # Max-heap of the smaller half (negated values)
+        self._upper = []  # Min-heap of the larger half
+
+    def __len__(self):
+        return len(self._lower) + len(self._upper)
+
+    def add(self, value):
+        """ Adds one element in O(log n). """
+        if self._lower and value > -self._lower[0]:
+            heapq.heappush(self._upper, value)
+        else:
+            heapq.heappush(self._lower, -value)
+        # Rebalance so that len(lower) is len(upper) or len(upper) + 1
+        if len(self._lower) > len(self._upper) + 1:
+            heapq.heappush(self._upper, -heapq.heappop(self._lower))
+        elif len(self._upper) > len(self._lower):
+            heapq.heappush(self._lower, -heapq.heappop(self._upper))
+
+    def add_many(self, values):
+        """ Adds every element of an iterable (or iterator). """
+        for value in values:
+            self.add(value)
+
+    def median(self):
+        """
+        Returns the lower median, i.e. the ((n + 1) // 2)-th smallest element,
+        which is what deterministic_select(arr, (len(arr) + 1) // 2) returns.
+        Returns a message if no elements have been added.
+        """
+        if not self._lower:
+            return "No elements yet!"
+        return -self._lower[0]
+
+
+def running_medians(values):
+    """
+    Yields the median of the stream so far after each element of values.
+    """
+    tracker = RunningMedian()
+    for value in values:
+        tracker.add(value)
+        yield tracker.median()
+
+
+class KLLSketch:
+    """
+    Mergeable approximate quantile sketch.
+    Elements go into a stack of compactors. Level h holds elements that each stand
+    for 2^h original elements. When a level fills up it is sorted and every other
+    element (starting at a random offset) is promoted to the next level, so the
+    sketch keeps O(k) elements no matter how long the stream is. Capacities shrink
+    by a factor c toward the lower levels.
+    The rank error of a query is roughly 1.7 / k of the stream length; use
+    KLLSketch.for_error(epsilon) to pick k from a target error.
+    """
+    def __init__(self, k=200, c=2 / 3, seed=None):
+        if k < 8:
+            raise ValueError("k must be at least 8")
+        self.k = k
+        self.c = c
+        self.count = 0  # Number of elements added (the total weight)
+        self._rng = random.Random(seed)
+        self._compactors = [[]]
+        self._size = 0  # Elements currently stored across all levels
+        self._max_size = self._capacity(0)
+
+    @classmethod
+    def for_error(cls, epsilon, seed=None):
+        """ Returns a sketch whose rank error is about epsilon (e.g. 0.01 for 1%). """
+        return cls(k=max(8, math.ceil(1.7 / epsilon)), seed=seed)
+
+    def __len__(self):
+        return self.count
+
+    def _capacity(self, level):
+        depth = len(self._compactors) - level - 1  # The top level gets the full k
+        return int(math.ceil(self.k * self.c ** depth)) + 1
+
+    def _grow(self):
+        self._compactors.append([])
+        self._max_size = sum(self._capacity(level) for level in range(len(self._compactors)))
+
+    def add(self, value):
+        """ Adds one element. """
+        self._compactors[0].append(value)
+        self._size += 1
+        self.count += 1
+        if self._size >= self._max_size:
+            self._compress()
+
+    def add_many(self, values):
+        """ Adds every element of an iterable (or iterator). """
+        for value in values:
+            self.add(value)
+
+    def _compress(self):
+        """ Compacts full levels, lowest first, until the sketch is under its size budget. """
+        for level in range(len(self._compactors)):
+            items = self._compactors[level]
+            if len(items) >= self._capacity(level):
+                if level + 1 == len(self._compactors):
+                    self._grow()
+                items.sort()
+                even = len(items) & ~1  # An odd element out stays at this level
+                offset = self._rng.randint(0, 1)
+                self._compactors[level + 1].extend(items[offset:even:2])
+                del items[:even]
+                self._size = sum(len(compactor) for compactor in self._compactors)
+                if self._size < self._max_size:
+                    break  # Compact lazily: only as much as needed
+
+    def merge(self, other):
+        """
+        Folds another sketch (for example one built on a different shard of the
+        data) into this one. The other sketch is left unchanged.
+        """
+        while len(self._compactors) < len(other._compactors):
+            self._grow()
+        for level, items in enumerate(other._compactors):
+            self._compactors[level].extend(items)
+        self.count += other.count
+        self._size = sum(len(compactor) for compactor in self._compactors)
+        while self._size >= self._max_size:
+            self._compress()
+        return self
+
+    def _weighted_items(self):
+        """ Returns the stored (value, weight) pairs sorted by value. """
+        items = []
+        for level, compactor in enumerate(self._compactors):
+            weight = 1 << level
+            items.extend((value, weight) for value in compactor)
+        items.sort(key=lambda item: item[0])
+        return items
+
+    def rank(self, value):
+        """ Estimates how many of the added elements are smaller than or equal to value. """
+        return sum(weight for stored, weight in self._weighted_items() if stored <= value)
+
+    def quantiles(self, qs):
+        """
+        Estimates the q-quantile for every q in qs (each between 0 and 1), i.e. the
+        element whose rank is about q * count. Returns the answers in the order given.
+        """
+        if not self.count:
+            return ["No elements yet!" for _ in qs]
+        items = self._weighted_items()
+        total = sum(weight for _, weight in items)
+        answers = {}
+        position, cumulative = 0, items[0][1]
+        for q in sorted(set(qs)):
+            target = max(q * total, 1)
+            while cumulative < target and position + 1 < len(items):
+                position += 1
+                cumulative += items[position][1]
+            answers[q] = items[position][0]
+        return [answers[q] for q in qs]
+
+    def quantile(self, q):
+        """ Estimates the q-quantile (0 <= q <= 1). """
+        return self.quantiles([q])[0]
+
+    def median(self):
+        """ Estimates the median. """
+        return self.quantile(0.5)
+
+    def stored_items(self):
+        """ Number of elements the sketch currently holds in memory. """
+        return self._size
+
+
+def run_streaming_comparison(size=200000, quantiles=(0.5, 0.9, 0.99), ks=(64, 200, 800), shards=8):
+    """
+    Feeds the same random stream to RunningMedian and to KLL sketches of several
+    sizes (one sketch over the whole stream, and one merged from shards sketches
+    of equal slices), then reports throughput, memory (stored elements) and the
+    rank error of each estimate against the exact answer from deterministic_select.
+    """
+    rng = random.Random(0)
+    data = [rng.gauss(0, 1) for _ in range(size)]
+
+    start_time = time.perf_counter()
+    exact = {q: deterministic_select(data.copy(), max(1, math.ceil(q * size))) for q in quantiles}
+    exact_time = time.perf_counter() - start_time
+    ordered = sorted(data)
+
+    def rank_error(estimate, q):
+        """ Distance between the estimate's true rank and the wanted rank, as a fraction of size. """
+        return abs(bisect.bisect_right(ordered, estimate) - q * size) / size
+
+    print(f"\nStreaming quantiles over {size} elements (exact selection took {exact_time:.3f}s):\n")
+    print(f"{'estimator':<22}{'elements/s':>12}{'stored':>9}" + "".join(f"{f'err p{q * 100:g}':>11}" for q in quantiles))
+
+    tracker = RunningMedian()
+    start_time = time.perf_counter()
+    tracker.add_many(iter(data))
+    rate = size / (time.perf_counter() - start_time)
+    cells = "".join(f"{rank_error(tracker.median(), q):>11.4%}" if q == 0.5 else f"{'-':>11}" for q in quantiles)
+    print(f"{'two heaps (median)':<22}{rate:>12,.0f}{len(tracker):>9}{cells}")
+
+    for k in ks:
+        sketch = KLLSketch(k=k, seed=1)
+        start_time = time.perf_counter()
+        sketch.add_many(iter(data))
+        rate = size / (time.perf_counter() - start_time)
+        estimates = sketch.quantiles(quantiles)
+        cells = "".join(f"{rank_error(estimate, q):>11.4%}" for estimate, q in zip(estimates, quantiles))
+        print(f"{f'KLL k={k}':<22}{rate:>12,.0f}{sketch.stored_items():>9}{cells}")
+
+        chunk = size // shards
+        merged = KLLSketch(k=k, seed=2)
+        for shard in range(shards):
+            part = KLLSketch(k=k, seed=10 + shard)
+            part.add_many(data[shard * chunk:(shard + 1) * chunk if shard < shards - 1 else size])
+            merged.merge(part)
+        estimates = merged.quantiles(quantiles)
+        cells = "".join(f"{rank_error(estimate, q):>11.4%}" for estimate, q in zip(estimates, quantiles))
+        print(f"{f'KLL k={k} ({shards} shards)':<22}{'':>12}{merged.stored_items():>9}{cells}")
+
+    for q in quantiles:
+        print(f"exact p{q * 100:g}: {exact[q]:.4f}")
+
+
+if __name__ == "__main__":
+    run_streaming_comparison()
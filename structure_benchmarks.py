@@ -0,0 +1,421 @@
+"""
+This Python script benchmarks the data structures in this repo.
+Each benchmark prints its results as a small table so runs can be compared.
+Run all of them with "python3 structure_benchmarks.py", or pick some by name,
+e.g. "python3 structure_benchmarks.py concurrent".
+"""
+
+import array
+import functools
+import heapq
+import os
+import pickle
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from caches import memoize
+from concurrent_data_structures import ConcurrentQueue, ConcurrentStack
+from elementary_data_structures import (LinkedList, MyArray, MyMatrix, PriorityQueue, Queue, Stack,
+                                        TOP_K_SELECTION_RATIO, load_snapshot, nsmallest, np)
+from sparse_matrix import COOMatrix
+
+
+# Multi-producer / multi-consumer throughput
+
+def measure_concurrent_throughput(container_class, producers, consumers, items_per_producer, batch=1):
+    """
+    Runs producers and consumers threads against one shared container and
+    returns the number of elements moved per second.
+    With batch > 1 (queues only) the threads use enqueue_many/dequeue_many.
+    """
+    container = container_class()
+    if container_class is ConcurrentQueue:
+        put, take = container.enqueue, container.dequeue
+    else:
+        put, take = container.push, container.pop
+    producers_done = threading.Event()
+    consumed = [0] * consumers  # One counter per consumer, so no lock is needed
+
+    def produce():
+        if batch > 1:
+            for start in range(0, items_per_producer, batch):
+                container.enqueue_many(range(start, min(start + batch, items_per_producer)))
+        else:
+            for value in range(items_per_producer):
+                put(value)
+
+    def consume(slot):
+        while True:
+            if batch > 1:
+                got = len(container.dequeue_many(batch, timeout=0.01))
+            else:
+                got = 0 if isinstance(take(timeout=0.01), str) else 1
+            consumed[slot] += got
+            if not got and producers_done.is_set() and container.is_empty():
+                break  # Producers are finished and everything has been drained
+
+    producer_threads = [threading.Thread(target=produce) for _ in range(producers)]
+    consumer_threads = [threading.Thread(target=consume, args=(i,)) for i in range(consumers)]
+
+    start_time = time.perf_counter()
+    for thread in producer_threads + consumer_threads:
+        thread.start()
+    for thread in producer_threads:
+        thread.join()
+    producers_done.set()
+    for thread in consumer_threads:
+        thread.join()
+    elapsed = time.perf_counter() - start_time
+
+    total = producers * items_per_producer
+    assert sum(consumed) == total, "Some elements were lost or duplicated!"
+    return total / elapsed
+
+
+def benchmark_concurrent(items_per_producer=50000):
+    """
+    Measures throughput of ConcurrentStack and ConcurrentQueue for growing
+    numbers of producer and consumer threads.
+    """
+    thread_counts = [1, 2, 4, 8]
+    print("\nMulti-producer / multi-consumer throughput (elements per second):\n")
+    print(f"{'threads (P+C)':<15}{'Stack':>14}{'Queue':>14}{'Queue x64':>14}")
+    for count in thread_counts:
+        stack_rate = measure_concurrent_throughput(ConcurrentStack, count, count, items_per_producer)
+        queue_rate = measure_concurrent_throughput(ConcurrentQueue, count, count, items_per_producer)
+        batch_rate = measure_concurrent_throughput(ConcurrentQueue, count, count, items_per_producer, batch=64)
+        print(f"{f'{count}+{count}':<15}{stack_rate:>14,.0f}{queue_rate:>14,.0f}{batch_rate:>14,.0f}")
+
+
+# Linked list memory and build time
+
+class LegacyNode:
+    """ The original Node: a plain class, so every instance carries a __dict__. """
+    def __init__(self, data=None):
+        self.data = data
+        self.next = None
+
+class LegacyLinkedList:
+    """ The original LinkedList: no tail pointer, so every insert walks the whole list. """
+    def __init__(self):
+        self.head = None
+
+    def insert(self, data):
+        new_node = LegacyNode(data)
+        if self.head is None:
+            self.head = new_node
+        else:
+            current = self.head
+            while current.next:
+                current = current.next
+            current.next = new_node
+
+
+def measure_build(build, size):
+    """
+    Builds a list of size elements with build(size) and returns
+    (seconds taken, bytes allocated per element).
+    """
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    built = build(size)
+    elapsed = time.perf_counter() - start_time
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del built
+    return elapsed, allocated / size
+
+
+def build_legacy(size):
+    linked_list = LegacyLinkedList()
+    for value in range(size):
+        linked_list.insert(value)
+    return linked_list
+
+
+def build_insert(size, doubly=False):
+    linked_list = LinkedList(items=(), doubly=doubly)
+    for value in range(size):
+        linked_list.insert(value)
+    return linked_list
+
+
+def benchmark_linked_list(sizes=(100000, 300000, 1000000), legacy_limit=5000):
+    """
+    Compares build time and memory per node of the original LinkedList with the
+    tail-pointer/__slots__ version (insert loop, extend, and doubly linked mode).
+    The original is quadratic, so it is only run up to legacy_limit elements and
+    extrapolated (time grows with size squared) for the larger sizes.
+    Note: timings are taken while tracemalloc is running, which slows everything
+    down by a similar factor; compare the columns against each other.
+    """
+    legacy_time, legacy_bytes = measure_build(build_legacy, legacy_limit)
+    print("\nLinked list build time (seconds) and memory per node (bytes):\n")
+    print(f"{'size':>10}{'legacy (est.)':>16}{'insert':>10}{'extend':>10}{'doubly':>10}")
+    for size in sizes:
+        estimate = legacy_time * (size / legacy_limit) ** 2
+        insert_time, insert_bytes = measure_build(build_insert, size)
+        extend_time, extend_bytes = measure_build(lambda n: LinkedList(items=range(n)), size)
+        doubly_time, doubly_bytes = measure_build(lambda n: build_insert(n, doubly=True), size)
+        print(f"{size:>10}{estimate:>16.2f}{insert_time:>10.3f}{extend_time:>10.3f}{doubly_time:>10.3f}")
+    print(f"\n{'bytes/node':>10}{legacy_bytes:>16.1f}{insert_bytes:>10.1f}{extend_bytes:>10.1f}{doubly_bytes:>10.1f}")
+
+
+# Cache hit/miss throughput
+
+def make_cache_trace(kind, length, maxsize, seed=0):
+    """
+    Returns a list of keys to look up.
+    "hit-heavy" draws from a skewed key space a little larger than the cache,
+    so most lookups hit; "churn-heavy" draws uniformly from a key space ten
+    times the cache size, so most lookups miss and evict.
+    """
+    rng = random.Random(seed)
+    if kind == "hit-heavy":
+        keys = maxsize * 2
+        return [int(keys * rng.random() ** 3) for _ in range(length)]  # Skewed toward small keys
+    return [rng.randrange(maxsize * 10) for _ in range(length)]
+
+
+def time_cached_function(decorator, trace):
+    """ Replays trace through a cached identity function and returns (seconds, hit ratio). """
+    @decorator
+    def lookup(key):
+        return key
+
+    start_time = time.perf_counter()
+    for key in trace:
+        lookup(key)
+    elapsed = time.perf_counter() - start_time
+    info = lookup.cache_info()
+    hits = info["hits"] if isinstance(info, dict) else info.hits
+    return elapsed, hits / len(trace)
+
+
+def benchmark_caches(length=500000, maxsize=1024):
+    """
+    Compares memoize (LRU and LFU policies) with functools.lru_cache on
+    hit-heavy and churn-heavy traces. functools.lru_cache is implemented in C,
+    so it is the baseline to beat rather than to match.
+    """
+    contenders = [
+        ("functools.lru_cache", functools.lru_cache(maxsize=maxsize)),
+        ("memoize lru", memoize(maxsize=maxsize)),
+        ("memoize lfu", memoize(maxsize=maxsize, policy="lfu")),
+    ]
+    print(f"\nCache lookups per second ({length} lookups, maxsize {maxsize}):\n")
+    print(f"{'trace':<14}{'cache':<22}{'lookups/s':>14}{'hit ratio':>11}")
+    for kind in ("hit-heavy", "churn-heavy"):
+        trace = make_cache_trace(kind, length, maxsize)
+        for name, decorator in contenders:
+            elapsed, hit_ratio = time_cached_function(decorator, trace)
+            print(f"{kind:<14}{name:<22}{length / elapsed:>14,.0f}{hit_ratio:>11.1%}")
+
+
+# Sparse vs dense matrices
+
+def random_coo(size, density, seed=0):
+    """ Builds a size x size COO matrix with about density * size^2 random nonzeros. """
+    rng = random.Random(seed)
+    count = int(size * size * density)
+    coo = COOMatrix(size, size)
+    coo.insert_many([rng.randrange(size) for _ in range(count)],
+                    [rng.randrange(size) for _ in range(count)],
+                    [rng.random() + 0.5 for _ in range(count)])
+    return coo
+
+
+def benchmark_sparse(size=3000, densities=(0.01, 0.001), repeats=20):
+    """
+    Compares memory use and matrix-vector product throughput of CSRMatrix with
+    the dense MyMatrix holding the same values, at each density.
+    """
+    vector = [1.0] * size
+    column = MyMatrix(data=[[1.0] for _ in range(size)], dtype="float64")
+    print(f"\nSparse vs dense {size}x{size} matrix (matvec repeated {repeats} times):\n")
+    print(f"{'density':>8}{'nnz':>10}{'CSR MB':>9}{'dense MB':>10}{'CSR matvec/s':>14}{'dense matvec/s':>16}")
+    for density in densities:
+        csr = random_coo(size, density).to_csr()
+        dense = csr.to_dense()
+        dense_bytes = dense._data.nbytes if np is not None else len(dense._data) * dense._data.itemsize
+
+        start_time = time.perf_counter()
+        for _ in range(repeats):
+            csr.matvec(vector)
+        csr_rate = repeats / (time.perf_counter() - start_time)
+
+        dense_repeats = repeats if np is not None else 1  # The pure-Python dense product is very slow
+        start_time = time.perf_counter()
+        for _ in range(dense_repeats):
+            dense.matmul(column)
+        dense_rate = dense_repeats / (time.perf_counter() - start_time)
+
+        print(f"{density:>8.1%}{csr.nnz:>10}{csr.nbytes / 1e6:>9.2f}{dense_bytes / 1e6:>10.2f}"
+              f"{csr_rate:>14,.1f}{dense_rate:>16,.1f}")
+
+
+# List-backed vs typed MyArray
+
+def time_call(func, *args):
+    """ Returns the seconds one call of func(*args) takes. """
+    start_time = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start_time
+
+
+def benchmark_typed_array(size=1000000, delete_fraction=0.1, seed=0):
+    """
+    Compares the original list-backed MyArray with the typed (int64) one:
+    memory per element, bulk extend from a buffer, deleting delete_fraction of
+    the elements (one delete() per index for the list-backed array, as the
+    original class had to, versus one delete_many() call), and filtering.
+    Per-index deletes shift the tail every time, so that column uses a
+    smaller array and is scaled up quadratically: (size / small) ** 2, since
+    both the number of deletes and the cost of each grow with the size.
+    """
+    rng = random.Random(seed)
+    source = array.array("q", range(size))
+    doomed = rng.sample(range(size), int(size * delete_fraction))
+    keep_even = lambda value: value % 2 == 0
+
+    list_array = MyArray(items=range(size))
+    typed_array = MyArray(items=(), dtype="int64")
+    print(f"\nList-backed vs typed MyArray ({size} elements):\n")
+    print(f"{'':<28}{'list':>12}{'int64':>12}")
+    list_extend = time_call(MyArray(items=()).extend, source)
+    typed_extend = time_call(typed_array.extend, source)
+    print(f"{'bytes per element':<28}{list_array.nbytes / size:>12.1f}{typed_array.nbytes / size:>12.1f}")
+    print(f"{'extend from buffer (s)':<28}{list_extend:>12.4f}{typed_extend:>12.4f}")
+
+    small = size // 20
+    small_array = MyArray(items=range(small))
+    small_doomed = sorted(rng.sample(range(small), int(small * delete_fraction)), reverse=True)
+
+    def delete_one_by_one():
+        for index in small_doomed:  # Highest index first so the others stay valid
+            small_array.delete(index)
+
+    list_delete = time_call(delete_one_by_one) * (size / small) ** 2  # n deletes, each O(n)
+    typed_delete = time_call(typed_array.delete_many, doomed)
+    print(f"{'delete 10% of indices (s)':<28}{list_delete:>12.4f}{typed_delete:>12.4f}")
+
+    list_filter = time_call(list_array.filter, keep_even)
+    typed_filter = time_call(typed_array.filter, keep_even)
+    print(f"{'filter even values (s)':<28}{list_filter:>12.4f}{typed_filter:>12.4f}")
+
+
+# Heap-based vs selection-based top-k
+
+def benchmark_top_k(sizes=(100000, 1000000), ratios=(0.0001, 0.001, 0.01, 0.1, 0.5), seed=0):
+    """
+    Times nsmallest with a heap (a PriorityQueue holding the k smallest so far) and with
+    selection (randomized_quickselect, then sorting what is below the k-th value)
+    for several k / n ratios, next to heapq.nsmallest and a full sort, and checks
+    that all four agree. The crossover is where TOP_K_SELECTION_RATIO should sit.
+    Also times PriorityQueue pushes and pops against heapq.
+    """
+    rng = random.Random(seed)
+    nsmallest(range(10000), 10, method="select")  # Untimed, so NumPy's first import isn't counted
+    print(f"\nTop-k: heap vs selection (auto switches at k / n = {TOP_K_SELECTION_RATIO}):\n")
+    print(f"{'n':>9}{'k / n':>8}{'heap (s)':>11}{'select (s)':>12}{'heapq (s)':>11}{'sort (s)':>10}{'faster':>8}")
+    for size in sizes:
+        values = [rng.random() for _ in range(size)]
+        for ratio in ratios:
+            k = max(1, int(size * ratio))
+            expected = sorted(values)[:k]
+            cells = []
+            for run in (lambda: nsmallest(values, k, method="heap"),
+                        lambda: nsmallest(values, k, method="select"),
+                        lambda: heapq.nsmallest(k, values),
+                        lambda: sorted(values)[:k]):
+                start_time = time.perf_counter()
+                result = run()
+                cells.append(time.perf_counter() - start_time)
+                assert result == expected, "top-k methods disagree!"
+            faster = "heap" if cells[0] < cells[1] else "select"
+            print(f"{size:>9}{ratio:>8g}" + "".join(f"{cell:>{width}.4f}" for cell, width in zip(cells, (11, 12, 11, 10)))
+                  + f"{faster:>8}")
+
+    # Tuples such as (priority, "job") must work with both methods too
+    jobs = [(rng.randrange(100), f"job{index}") for index in range(10000)]
+    for k in (1, 10, 5000):
+        expected = sorted(jobs)[:k]
+        for method in ("heap", "select"):
+            assert nsmallest(jobs, k, method=method) == expected, "top-k methods disagree on tuples!"
+
+    size = sizes[0]
+    values = [rng.random() for _ in range(size)]
+    heap = PriorityQueue(items=())
+    push_time = time_call(lambda: [heap.push(value) for value in values])
+    pop_time = time_call(lambda: [heap.pop() for _ in range(size)])
+    plain = []
+    heapq_push = time_call(lambda: [heapq.heappush(plain, value) for value in values])
+    heapq_pop = time_call(lambda: [heapq.heappop(plain) for _ in range(size)])
+    print(f"\n{size} pushes then pops: PriorityQueue {push_time:.4f}s / {pop_time:.4f}s, "
+          f"heapq {heapq_push:.4f}s / {heapq_pop:.4f}s")
+
+
+# Binary snapshots vs pickle
+
+def benchmark_snapshot(size=1000000):
+    """
+    Saves and restores each structure holding size integers (the matrix has about
+    size cells) with dump()/load() and with pickle, and compares the times and
+    file sizes. Typed arrays and matrices are also loaded with zero_copy=True.
+    Pickling a long singly linked list recurses once per node, so it may fail
+    with RecursionError, which is reported instead of a time.
+    """
+    side = int(size ** 0.5)
+    structures = {
+        "MyArray (list)": MyArray(items=range(size)),
+        "MyArray (int64)": MyArray(items=range(size), dtype="int64"),
+        "MyMatrix (int64)": MyMatrix(data=[list(range(row * side, (row + 1) * side)) for row in range(side)]),
+        "Stack": Stack(items=range(size)),
+        "Queue": Queue(items=range(size)),
+        "LinkedList": LinkedList(items=range(size)),
+    }
+    print(f"\nSnapshots vs pickle ({size} elements):\n")
+    print(f"{'structure':<18}{'dump (s)':>10}{'load (s)':>10}{'MB':>8}{'pickle dump':>13}{'pickle load':>13}"
+          f"{'pickle MB':>11}{'zero-copy (s)':>15}")
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "snapshot.bin")
+        for name, structure in structures.items():
+            dump_time = time_call(structure.dump, path)
+            snapshot_mb = os.path.getsize(path) / 1e6
+            load_time = time_call(load_snapshot, path)
+            zero_copy = "-"
+            if "int64" in name:
+                start_time = time.perf_counter()
+                mapped = load_snapshot(path, zero_copy=True)
+                zero_copy = f"{time.perf_counter() - start_time:.5f}"
+                mapped.close()
+            try:
+                start_time = time.perf_counter()
+                pickled = pickle.dumps(structure, protocol=pickle.HIGHEST_PROTOCOL)
+                pickle_dump = time.perf_counter() - start_time
+                pickle_load = time_call(pickle.loads, pickled)
+                pickle_cells = f"{pickle_dump:>13.4f}{pickle_load:>13.4f}{len(pickled) / 1e6:>11.1f}"
+            except RecursionError:
+                pickle_cells = f"{'RecursionError':>37}"
+            print(f"{name:<18}{dump_time:>10.4f}{load_time:>10.4f}{snapshot_mb:>8.1f}{pickle_cells}{zero_copy:>15}")
+
+
+BENCHMARKS = {
+    "concurrent": benchmark_concurrent,
+    "linked_list": benchmark_linked_list,
+    "caches": benchmark_caches,
+    "sparse": benchmark_sparse,
+    "typed_array": benchmark_typed_array,
+    "top_k": benchmark_top_k,
+    "snapshot": benchmark_snapshot,
+}
+
+
+if __name__ == "__main__":
+    names = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
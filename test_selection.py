@@ -0,0 +1,41 @@
+"""
+Regression tests for the backend choice in selection.py: in auto mode, inputs
+NumPy can't represent faithfully must stay on the pure-Python path.
+"""
+
+import random
+
+import pytest
+
+from selection import NUMPY_MIN_SIZE, deterministic_select, multiselect, randomized_quickselect
+
+SIZE = NUMPY_MIN_SIZE + 500  # Large enough for auto mode to consider NumPy
+
+
+def _inputs():
+    rng = random.Random(0)
+    tuples = [(rng.random(), f"job{index}") for index in range(SIZE)]
+    big_ints = [2 ** 70 + rng.randrange(10 ** 6) for _ in range(SIZE)]
+    mixed = [rng.randrange(1000) for _ in range(SIZE)] + [0.5]
+    return {"tuples": tuples, "big ints": big_ints, "mixed int/float": mixed}
+
+
+@pytest.mark.parametrize("name", ["tuples", "big ints", "mixed int/float"])
+@pytest.mark.parametrize("select", [deterministic_select, randomized_quickselect])
+def test_auto_backend_keeps_python_values(name, select):
+    arr = _inputs()[name]
+    ordered = sorted(arr)
+    for k in (1, len(arr) // 2, len(arr)):
+        result = select(arr.copy(), k)
+        assert result == ordered[k - 1]
+        assert type(result) is type(ordered[k - 1])
+
+
+@pytest.mark.parametrize("name", ["tuples", "big ints", "mixed int/float"])
+def test_multiselect_auto_backend_keeps_python_values(name):
+    arr = _inputs()[name]
+    ordered = sorted(arr)
+    ks = [1, len(arr) // 2, len(arr)]
+    results = multiselect(arr, ks)
+    assert results == [ordered[k - 1] for k in ks]
+    assert [type(result) for result in results] == [type(ordered[k - 1]) for k in ks]